@@ -0,0 +1,13 @@
+from .compiled_scene import CompiledScene
+from .model_builder import PhysicsOptions, assign_materials, build_model, build_spec, domino_body_ids
+from .model_cache import ModelCache
+
+__all__ = [
+    "CompiledScene",
+    "ModelCache",
+    "PhysicsOptions",
+    "assign_materials",
+    "build_model",
+    "build_spec",
+    "domino_body_ids",
+]
@@ -0,0 +1,139 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+from Domino.components.component import Component
+from Domino.components.domino import Domino
+from Domino.components.domino_array import DominoArray
+from Domino.geometry.pose import PoseArray
+from Domino.geometry.collision import AABB, OBBArray, SAT
+
+
+@dataclass
+class CompiledScene:
+    """
+    A component tree flattened into arrays in one traversal. Nodes are all components in depth-first order (so the
+    subtree of node i is the index range [i, node_subtree_ends[i])), leaves are the components without children, in
+    the same order as collect_leaves(). A `DominoArray` is expanded into one `Domino` leaf node per element, so that
+    every leaf is one body. Every later stage (XML writing, collision checks, material assignment,
+    analysis) works on these arrays instead of walking the object graph again.
+    """
+    kind_names: list[str]
+    # Per node: "/" joined child names from the root ("" for the root), parent index (-1 for the root), kind id.
+    node_paths: list[str]
+    node_parents: np.ndarray
+    node_subtree_ends: np.ndarray
+    node_kinds: np.ndarray
+    # Per leaf: node index, path, world pose, box half extents (zero for leaves without collision geometry).
+    leaf_nodes: np.ndarray
+    leaf_paths: list[str]
+    leaf_to_world: PoseArray
+    leaf_half_extents: np.ndarray
+
+    @staticmethod
+    def from_component(root: Component) -> "CompiledScene":
+        kind_names, kind_ids, kind_half_extents = [], {}, []
+        node_paths, node_parents, node_subtree_ends, node_kinds = [], [], [], []
+        positions, rotations, depths = [], [], []
+        leaf_nodes = []
+        # Iterative pre-order traversal, where a None entry marks the end of the subtree on top of the path stack.
+        stack = [(root, "", -1, 0)]
+        open_nodes = []
+        while len(stack) > 0:
+            entry = stack.pop()
+            if entry is None:
+                node_subtree_ends[open_nodes.pop()] = len(node_paths)
+                continue
+            component, path, parent, depth = entry
+            kind = type(component)
+            if kind not in kind_ids:
+                kind_ids[kind] = len(kind_names)
+                kind_names.append(kind.__name__)
+                kind_half_extents.append(None)
+            index = len(node_paths)
+            node_paths.append(path)
+            node_parents.append(parent)
+            node_subtree_ends.append(index + 1)
+            node_kinds.append(kind_ids[kind])
+            positions.append(component.to_parent.position[np.newaxis])
+            rotations.append(component.to_parent.rotation[np.newaxis])
+            depths.append(depth)
+            if isinstance(component, DominoArray):
+                # Elements are appended as a block of leaf nodes right after the array node.
+                if Domino not in kind_ids:
+                    kind_ids[Domino] = len(kind_names)
+                    kind_names.append(Domino.__name__)
+                    kind_half_extents.append(Domino.SIZE / 2)
+                element_count = len(component)
+                prefix = f"{path}/" if path != "" else ""
+                node_paths.extend(f"{prefix}{name}" for name in component.element_names())
+                node_parents.extend([index] * element_count)
+                node_subtree_ends[index] = index + 1 + element_count
+                node_subtree_ends.extend(range(index + 2, index + 2 + element_count))
+                node_kinds.extend([kind_ids[Domino]] * element_count)
+                positions.append(component.positions)
+                rotations.append(component.rotations)
+                depths.extend([depth + 1] * element_count)
+                leaf_nodes.extend(range(index + 1, index + 1 + element_count))
+                continue
+            if len(component.children) == 0:
+                leaf_nodes.append(index)
+                if kind_half_extents[kind_ids[kind]] is None:
+                    kind_half_extents[kind_ids[kind]] = component.obb_in_world().half_extents if hasattr(component, "obb_in_world") else np.zeros(3)
+                continue
+            open_nodes.append(index)
+            stack.append(None)
+            for name, child in reversed(list(component.children.items())):
+                stack.append((child, f"{path}/{name}" if path != "" else name, index, depth + 1))
+        # Compose world poses one tree level at a time, each level in a single vectorized call.
+        node_parents, depths = np.array(node_parents), np.array(depths)
+        node_to_world = PoseArray(np.concatenate(positions), np.concatenate(rotations))
+        root_to_world = root.to_world()
+        node_to_world.positions[0], node_to_world.rotations[0] = root_to_world.position, root_to_world.rotation
+        for depth in range(1, np.max(depths) + 1):
+            level = np.flatnonzero(depths == depth)
+            level_to_world = node_to_world[node_parents[level]] * node_to_world[level]
+            node_to_world.positions[level], node_to_world.rotations[level] = level_to_world.positions, level_to_world.rotations
+        leaf_nodes, node_kinds = np.array(leaf_nodes), np.array(node_kinds)
+        return CompiledScene(
+            kind_names=kind_names,
+            node_paths=node_paths,
+            node_parents=node_parents,
+            node_subtree_ends=np.array(node_subtree_ends),
+            node_kinds=node_kinds,
+            leaf_nodes=leaf_nodes,
+            leaf_paths=[node_paths[node] for node in leaf_nodes],
+            leaf_to_world=node_to_world[leaf_nodes],
+            leaf_half_extents=np.array([kind_half_extents[kind] for kind in node_kinds[leaf_nodes]]).reshape(-1, 3),
+        )
+
+    def __len__(self) -> int:
+        return len(self.leaf_nodes)
+
+    @property
+    def leaf_kinds(self) -> np.ndarray:
+        return self.node_kinds[self.leaf_nodes]
+
+    def leaves_of_kind(self, kind: type) -> np.ndarray:
+        # (L,) mask of leaves whose class is exactly kind.
+        if kind.__name__ not in self.kind_names:
+            return np.zeros(len(self), dtype=bool)
+        return self.leaf_kinds == self.kind_names.index(kind.__name__)
+
+    def leaves_under(self, path: str) -> np.ndarray:
+        # (L,) mask of leaves in the subtree of the node at path.
+        node = self.node_paths.index(path)
+        return (self.leaf_nodes >= node) & (self.leaf_nodes < self.node_subtree_ends[node])
+
+    def obbs(self) -> OBBArray:
+        return OBBArray(self.leaf_to_world, self.leaf_half_extents)
+
+    def penetrating_pairs(self, tolerance: float = 1.0E-4) -> np.ndarray:
+        # (P, 2) leaf index pairs that overlap deeper than tolerance, e.g. to check a layout before simulating it.
+        has_geometry = np.any(self.leaf_half_extents > 0, axis=1)
+        indices = np.flatnonzero(has_geometry)
+        obbs = self.obbs()[indices]
+        lower, upper = AABB.of_obbs(obbs)
+        pairs = AABB.overlapping_pairs(lower, upper)
+        distances = SAT.separation_distance_pairs(obbs[pairs[:, 0]], obbs[pairs[:, 1]])
+        return indices[pairs[distances < -tolerance]]
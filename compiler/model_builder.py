@@ -0,0 +1,153 @@
+import os
+from dataclasses import dataclass
+
+import numpy as np
+import mujoco
+
+from Domino.components.domino import Domino
+from Domino.components.ground import Ground
+from Domino.compiler.compiled_scene import CompiledScene
+
+PALETTE = [
+    [0.96, 0.96, 0.96], # White
+    [0.92, 0.39, 0.12], # Orange
+    [0.86, 0.16, 0.16], # Red
+    # [0.55, 0.24, 0.71], # Purple
+    # [0.90, 0.35, 0.55], # Pink
+    # [0.39, 0.20, 0.16], # Brown
+    [0.12, 0.12, 0.12], # Black
+    [0.94, 0.82, 0.08], # Yellow
+    [0.12, 0.63, 0.24], # Green
+    [0.20, 0.71, 0.86], # Light Blue / Cyan
+    [0.08, 0.31, 0.71]  # Dark Blue
+]
+DOMINO_MESH_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "assets", "domino_bevel.obj")
+
+
+@dataclass(frozen=True)
+class PhysicsOptions:
+    timestep: float = 0.005
+    gravity: tuple[float, float, float] = (0, 0, -9.81)
+    integrator: int = mujoco.mjtIntegrator.mjINT_IMPLICIT
+    cone: int = mujoco.mjtCone.mjCONE_ELLIPTIC
+    solver: int = mujoco.mjtSolver.mjSOL_NEWTON
+    iterations: int = 100
+    noslip_iterations: int = 5
+    noslip_tolerance: float = 1.0E-5
+    # Arena size, MuJoCo's own estimate fails to allocate for a few thousand free bodies.
+    base_memory: int = 16 * 1024 * 1024
+    memory_per_body: int = 32 * 1024
+    # Geom defaults, and the overrides of domino collision boxes and the ground.
+    solref: tuple[float, float] = (0.025, 1)
+    solimp: tuple[float, float, float, float, float] = (0.99, 0.99, 0.002, 0.5, 2)
+    friction: tuple[float, float, float] = (1, 0.005, 0.0001)
+    domino_density: float = 1000
+    domino_friction: tuple[float, float, float] = (0.2, 0.005, 0.0001)
+    ground_friction: tuple[float, float, float] = (1.0, 0.01, 0.001)
+
+
+def assign_materials(compiled_scene: CompiledScene) -> np.ndarray:
+    # Random palette material for each domino leaf, -1 for other leaves.
+    material_ids = np.full(len(compiled_scene), -1)
+    dominoes = compiled_scene.leaves_of_kind(Domino)
+    material_ids[dominoes] = np.random.randint(len(PALETTE), size=np.count_nonzero(dominoes))
+    return material_ids
+
+
+def quaternions_from_rotations(rotations: np.ndarray) -> np.ndarray:
+    """
+    (N, 4) unit quaternions (w, x, y, z) of (N, 3, 3) rotations. Like MuJoCo's xyaxes, only the x and y axes are used
+    and z is their cross product, so reflections in the layout become proper rotations of the symmetric boxes.
+    """
+    x_axes, y_axes = rotations[:, :, 0], rotations[:, :, 1]
+    matrices = np.stack([x_axes, y_axes, np.cross(x_axes, y_axes)], axis=2)
+    # (N, 4, 4) products 4 q_i q_j, all linear in the matrix entries. Dividing the row of a large diagonal product by
+    # twice its square root gives the quaternion, the row picked by the same case split as mju_mat2Quat.
+    diagonals = np.diagonal(matrices, axis1=1, axis2=2)
+    traces = np.sum(diagonals, axis=1)
+    products = np.empty((len(matrices), 4, 4))
+    products[:, 0, 0] = 1 + traces
+    products[:, [1, 2, 3], [1, 2, 3]] = 1 + 2 * diagonals - traces[:, np.newaxis]
+    products[:, 0, 1] = products[:, 1, 0] = matrices[:, 2, 1] - matrices[:, 1, 2]
+    products[:, 0, 2] = products[:, 2, 0] = matrices[:, 0, 2] - matrices[:, 2, 0]
+    products[:, 0, 3] = products[:, 3, 0] = matrices[:, 1, 0] - matrices[:, 0, 1]
+    products[:, 1, 2] = products[:, 2, 1] = matrices[:, 1, 0] + matrices[:, 0, 1]
+    products[:, 1, 3] = products[:, 3, 1] = matrices[:, 0, 2] + matrices[:, 2, 0]
+    products[:, 2, 3] = products[:, 3, 2] = matrices[:, 2, 1] + matrices[:, 1, 2]
+    x_largest = (diagonals[:, 0] > diagonals[:, 1]) & (diagonals[:, 0] > diagonals[:, 2])
+    cases = np.where(traces > 0, 0, np.where(x_largest, 1, np.where(diagonals[:, 1] > diagonals[:, 2], 2, 3)))
+    rows = products[np.arange(len(matrices)), cases]
+    quaternions = rows / (2 * np.sqrt(rows[np.arange(len(matrices)), cases]))[:, np.newaxis]
+    return quaternions / np.linalg.norm(quaternions, axis=1, keepdims=True)
+
+
+def build_spec(compiled_scene: CompiledScene, material_ids: np.ndarray, options: PhysicsOptions = PhysicsOptions()) -> mujoco.MjSpec:
+    """
+    Builds the world through MuJoCo's MjSpec API, one free body per domino leaf with a collision box and a visual mesh.
+    Compile it with spec.compile(), or export it with spec.to_xml().
+    """
+    spec = mujoco.MjSpec()
+    spec.modelname = "world"
+    # Physics.
+    spec.option.timestep = options.timestep
+    spec.option.gravity = options.gravity
+    spec.option.integrator = options.integrator
+    spec.option.cone = options.cone
+    spec.option.solver = options.solver
+    spec.option.iterations = options.iterations
+    spec.option.noslip_iterations = options.noslip_iterations
+    spec.option.noslip_tolerance = options.noslip_tolerance
+    leaves = np.flatnonzero(compiled_scene.leaves_of_kind(Domino))
+    spec.memory = options.base_memory + options.memory_per_body * len(leaves)
+    spec.default.geom.solref = options.solref
+    spec.default.geom.solimp = options.solimp
+    spec.default.geom.friction = options.friction
+    # Visual.
+    spec.visual.global_.offwidth = 1280
+    spec.visual.global_.offheight = 720
+    spec.visual.headlight.ambient = [0.5, 0.5, 0.5]
+    spec.visual.headlight.diffuse = [0.8, 0.8, 0.8]
+    spec.visual.headlight.specular = [0.15, 0.15, 0.15]
+    # Assets, the domino mesh is loaded once and shared by all bodies.
+    spec.add_mesh(name="domino_bevel_mesh", file=DOMINO_MESH_FILE)
+    spec.add_texture(
+        name="grid", type=mujoco.mjtTexture.mjTEXTURE_2D, builtin=mujoco.mjtBuiltin.mjBUILTIN_CHECKER,
+        width=512, height=512, rgb1=[0.2, 0.3, 0.4], rgb2=[0.1, 0.15, 0.2]
+    )
+    grid = spec.add_material(name="grid", texrepeat=[6, 6], texuniform=True, reflectance=0.05)
+    grid.textures[mujoco.mjtTextureRole.mjTEXROLE_RGB] = "grid"
+    for material_id, color in enumerate(PALETTE):
+        spec.add_material(name=f"domino_mat_{material_id}", rgba=[*color, 1], specular=0.35, shininess=0.2, reflectance=0.1)
+    # World.
+    spec.worldbody.add_light(pos=[-2, -2, 5])
+    ground_half_extents = Ground().obb_in_world().half_extents
+    spec.worldbody.add_geom(
+        name="ground", type=mujoco.mjtGeom.mjGEOM_PLANE, size=[ground_half_extents[0], ground_half_extents[1], 0.1],
+        material="grid", friction=options.ground_friction, priority=1
+    )
+    positions = compiled_scene.leaf_to_world.positions[leaves]
+    quaternions = quaternions_from_rotations(compiled_scene.leaf_to_world.rotations[leaves])
+    for body_id, (leaf, position, quaternion) in enumerate(zip(leaves, positions, quaternions)):
+        body = spec.worldbody.add_body(name=f"body_{body_id}", pos=position, quat=quaternion)
+        body.add_freejoint()
+        body.add_geom(
+            name=f"collision_{body_id}", type=mujoco.mjtGeom.mjGEOM_BOX, size=Domino.SIZE / 2,
+            density=options.domino_density, friction=options.domino_friction, group=1
+        )
+        body.add_geom(
+            name=f"visual_{body_id}", type=mujoco.mjtGeom.mjGEOM_MESH, meshname="domino_bevel_mesh",
+            material=f"domino_mat_{material_ids[leaf]}", contype=0, conaffinity=0, group=0
+        )
+    return spec
+
+
+def domino_body_ids(model: mujoco.MjModel, compiled_scene: CompiledScene) -> np.ndarray:
+    # (D,) body ids of the domino leaves in leaf order, the i-th one being the body build_spec() named "body_{i}".
+    domino_count = np.count_nonzero(compiled_scene.leaves_of_kind(Domino))
+    return np.array([model.body(f"body_{body_id}").id for body_id in range(domino_count)], dtype=int)
+
+
+def build_model(compiled_scene: CompiledScene, material_ids: np.ndarray | None = None, options: PhysicsOptions = PhysicsOptions()) -> mujoco.MjModel:
+    if material_ids is None:
+        material_ids = assign_materials(compiled_scene)
+    return build_spec(compiled_scene, material_ids, options).compile()
@@ -0,0 +1,77 @@
+import os
+import hashlib
+from pathlib import Path
+import logging
+logger = logging.getLogger(__name__)
+
+import numpy as np
+import mujoco
+
+from Domino.components import ground
+from Domino.components.domino import Domino
+from Domino.components.ground import Ground
+from Domino.compiler import model_builder
+from Domino.compiler.compiled_scene import CompiledScene
+from Domino.compiler.model_builder import DOMINO_MESH_FILE, PhysicsOptions, build_spec
+
+
+class ModelCache:
+    """
+    On-disk cache of compiled models as MJB binaries, keyed by a hash of everything the model is built from: domino
+    leaf poses, material ids, physics options, `Domino.SIZE`, `Ground.HALF_SIZE` and the ground module, the mesh file,
+    the builder source and the MuJoCo version. A hit loads the binary directly, skipping the MjSpec build, the mesh processing and the compile.
+    """
+    def __init__(self, cache_dir: str | Path):
+        self.cache_dir = Path(cache_dir)
+        self._file_hashes = {}
+
+    def file_hash(self, path: str) -> str:
+        if path not in self._file_hashes:
+            with open(path, "rb") as file:
+                self._file_hashes[path] = hashlib.sha256(file.read()).hexdigest()
+        return self._file_hashes[path]
+
+    def key(self, compiled_scene: CompiledScene, material_ids: np.ndarray, options: PhysicsOptions) -> str:
+        leaves = np.flatnonzero(compiled_scene.leaves_of_kind(Domino))
+        content = hashlib.sha256()
+        content.update(np.ascontiguousarray(compiled_scene.leaf_to_world.positions[leaves]).tobytes())
+        content.update(np.ascontiguousarray(compiled_scene.leaf_to_world.rotations[leaves]).tobytes())
+        content.update(np.ascontiguousarray(material_ids[leaves], dtype=np.int64).tobytes())
+        content.update(repr(options).encode())
+        content.update(Domino.SIZE.tobytes())
+        content.update(np.asarray(Ground.HALF_SIZE, dtype=float).tobytes())
+        content.update(self.file_hash(ground.__file__).encode())
+        content.update(self.file_hash(DOMINO_MESH_FILE).encode())
+        content.update(self.file_hash(model_builder.__file__).encode())
+        content.update(mujoco.__version__.encode())
+        return content.hexdigest()
+
+    def path(self, key: str) -> Path:
+        return self.cache_dir / f"{key[:32]}.mjb"
+
+    def load(self, key: str) -> mujoco.MjModel | None:
+        path = self.path(key)
+        if not path.exists():
+            return None
+        try:
+            return mujoco.MjModel.from_binary_path(str(path))
+        except ValueError as error:
+            logger.warning(f"ignoring unreadable model cache file {path}: {error}")
+            return None
+
+    def save(self, key: str, model: mujoco.MjModel) -> None:
+        path = self.path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # NOTE Write then rename, so that concurrent runs never read a partial file.
+        temp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        mujoco.mj_saveModel(model, str(temp_path))
+        os.replace(temp_path, path)
+
+    def build_model(self, compiled_scene: CompiledScene, material_ids: np.ndarray, options: PhysicsOptions = PhysicsOptions()) -> mujoco.MjModel:
+        # Like model_builder.build_model(), but served from the cache when nothing changed.
+        key = self.key(compiled_scene, material_ids, options)
+        model = self.load(key)
+        if model is None:
+            model = build_spec(compiled_scene, material_ids, options).compile()
+            self.save(key, model)
+        return model
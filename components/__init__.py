@@ -1,12 +1,14 @@
-from .component import Component, PointRef, VectorRef
+from .component import Component, PointRef, VectorRef, clear_prototype_cache
 from .condition_gate import ConditionGate
 from .crossing import Crossing
 from .curve_domino import CurveDomino
 from .domino import Domino
+from .domino_array import DominoArray, DominoArrayElement
 from .elegant_and_gate import ElegantAndGate
 from .ground import Ground
 from .impulse_trigger import ImpulseTrigger
 from .lean_and_gate import LeanAndGate
+from .layout_cache import LayoutCache, enable_layout_cache
 from .line_domino import LineDomino
 from .negative_condition_gate import NegativeConditionGate
 from .pile_domino import PileDomino
@@ -22,9 +24,12 @@ __all__ = [
     "Crossing",
     "CurveDomino",
     "Domino",
+    "DominoArray",
+    "DominoArrayElement",
     "ElegantAndGate",
     "Ground",
     "ImpulseTrigger",
+    "LayoutCache",
     "LeanAndGate",
     "LineDomino",
     "NegativeConditionGate",
@@ -32,4 +37,6 @@ __all__ = [
     "OrGate",
     "SideBranch",
     "UTurn",
+    "clear_prototype_cache",
+    "enable_layout_cache",
 ]
@@ -1,4 +1,5 @@
-from copy import deepcopy
+from typing import Callable
+from functools import cache
 from dataclasses import dataclass
 import logging
 logger = logging.getLogger(__name__)
@@ -6,10 +7,10 @@ logger = logging.getLogger(__name__)
 import numpy as np
 
 from Domino.geometry.pose import Pose, rotation_matrix_from_axis_angle, rotation_matrix_from_rpy
-from Domino.geometry.collision import OBB, SAT
+from Domino.geometry.collision import AABB, OBB, OBBArray, SAT
 
 
-@dataclass
+@dataclass(slots=True)
 class PointRef:
     component: "Component | None"
     point: np.ndarray
@@ -22,10 +23,10 @@ class PointRef:
     def to_other(self, other: "Component | None") -> np.ndarray:
         if other is None:
             return self.to_world()
-        return other.to_world().inverse().apply_point(self.to_world())
+        return other.from_world().apply_point(self.to_world())
 
 
-@dataclass
+@dataclass(slots=True)
 class VectorRef:
     component: "Component | None"
     vector: np.ndarray
@@ -38,10 +39,10 @@ class VectorRef:
     def to_other(self, other: "Component | None") -> np.ndarray:
         if other is None:
             return self.to_world()
-        return other.to_world().inverse().apply_vector(self.to_world())
+        return other.from_world().apply_vector(self.to_world())
 
 
-@dataclass
+@dataclass(slots=True)
 class SocketRef:
     component: "Component | None"
     position: np.ndarray
@@ -54,16 +55,91 @@ class SocketRef:
         return component_to_world.apply_point(self.position), component_to_world.apply_vector(self.direction)
     
     def to_other(self, other: "Component | None") -> np.ndarray:
-        component_to_world, other_to_world = Pose(), Pose()
+        component_to_world, world_to_other = Pose(), Pose()
         if self.component is not None:
             component_to_world = self.component.to_world()
         if other is not None:
-            other_to_world = other.to_world()
-        component_to_other = other_to_world.inverse() * component_to_world
+            world_to_other = other.from_world()
+        component_to_other = world_to_other * component_to_world
         return component_to_other.apply_point(self.position), component_to_other.apply_vector(self.direction)
 
 
-class Component:
+class AnchorTable:
+    """
+    Named anchor points stored as one read-only (K, 3) array plus a name to row map. A table is built once per class
+    (or per size) and shared by all of its instances, instead of every instance holding a dict of small arrays.
+    """
+    __slots__ = ("indices", "positions")
+
+    def __init__(self, names: list[str], positions: np.ndarray):
+        self.indices = {name: index for index, name in enumerate(names)}
+        self.positions = np.array(positions, dtype=float).reshape(-1, 3)
+        if len(self.indices) != len(self.positions):
+            raise ValueError(f"got {len(self.indices)} anchor names but {len(self.positions)} positions")
+        self.positions.flags.writeable = False
+
+    @staticmethod
+    def box(size: np.ndarray, center: np.ndarray = np.zeros(3)) -> "AnchorTable":
+        # The 27 anchors at corners, edge midpoints, face centers and center of a box, e.g. "x+y-z+", "x+", "".
+        names, positions = [], []
+        for sign_x, label_x in [(-1, "x-"), (0, ""), (1, "x+")]:
+            for sign_y, label_y in [(-1, "y-"), (0, ""), (1, "y+")]:
+                for sign_z, label_z in [(-1, "z-"), (0, ""), (1, "z+")]:
+                    names.append(f"{label_x}{label_y}{label_z}")
+                    positions.append(np.array([sign_x, sign_y, sign_z]) * size / 2 + center)
+        return AnchorTable(names, np.stack(positions))
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.positions[self.indices[name]]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.indices
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    def keys(self):
+        return self.indices.keys()
+
+
+class ComponentMeta(type):
+    """
+    Caches one prototype per (class, constructor arguments) for classes with `CACHE_PROTOTYPE` set. The first call
+    builds and solves the layout, later calls return a `copy()` of it, so e.g. every `SideBranch()` after the first
+    skips its `move_to_touch` solving. Prototypes also persist across runs if a layout cache is enabled, see
+    `enable_layout_cache`.
+    """
+    _prototypes: dict[tuple, "Component"] = {}
+    layout_cache = None
+
+    def __call__(cls, *args, **kwargs):
+        if not cls.CACHE_PROTOTYPE:
+            return super().__call__(*args, **kwargs)
+        key = (cls, args, tuple(sorted(kwargs.items())))
+        try:
+            prototype = ComponentMeta._prototypes.get(key)
+        except TypeError:
+            # NOTE Unhashable arguments, e.g. arrays, are built from scratch every time.
+            return super().__call__(*args, **kwargs)
+        if prototype is None and ComponentMeta.layout_cache is not None:
+            prototype = ComponentMeta.layout_cache.load(cls, args, kwargs)
+        if prototype is None:
+            prototype = super().__call__(*args, **kwargs)
+            if ComponentMeta.layout_cache is not None:
+                ComponentMeta.layout_cache.save(cls, args, kwargs, prototype)
+        ComponentMeta._prototypes[key] = prototype
+        return prototype.copy()
+
+
+def clear_prototype_cache() -> None:
+    ComponentMeta._prototypes.clear()
+
+
+class Component(metaclass=ComponentMeta):
+    __slots__ = (
+        "parent", "_to_parent", "_to_world", "_from_world", "_world_bounds", "_children_bounds",
+        "children", "anchors", "sockets"
+    )
     NAME_TO_AXIS = {
         "x+": np.array([1, 0, 0]),
         "x-": np.array([-1, 0, 0]),
@@ -72,25 +148,71 @@ class Component:
         "z+": np.array([0, 0, 1]),
         "z-": np.array([0, 0, -1]),
     }
+    ANCHORS = AnchorTable([""], np.zeros((1, 3)))
+    # Set by components whose layout only depends on the constructor arguments, see ComponentMeta.
+    CACHE_PROTOTYPE = False
 
     def __init__(self, to_parent: Pose | None = None):
         self.parent = None
-        self.to_parent = to_parent if to_parent is not None else Pose()
+        self._to_parent = to_parent if to_parent is not None else Pose()
+        # Cached to_world() and its inverse, None when stale.
+        self._to_world = None
+        self._from_world = None
+        # Cached world bounds of the subtree leaves and (C, 2, 3) bounds of each child, None when stale.
+        self._world_bounds = None
+        self._children_bounds = None
         self.children = {}
-        self.anchors = {
-            "": np.array([0, 0, 0])
-        }
+        # NOTE Shared with all instances of the class, never modified in place.
+        self.anchors = self.ANCHORS
         self.sockets = {}
     
     def copy(self) -> "Component":
-        return deepcopy(self)
+        # Clones the subtree only, detached from the parent. Anchors and socket arrays are shared, since they are
+        # only ever replaced and never modified in place.
+        clone = object.__new__(type(self))
+        for slot in Component._slot_names(type(self)):
+            if hasattr(self, slot):
+                setattr(clone, slot, getattr(self, slot))
+        if hasattr(self, "__dict__"):
+            clone.__dict__.update(self.__dict__)
+        clone.parent = None
+        clone._to_parent = Pose(self.to_parent.position, self.to_parent.rotation)
+        clone._to_world = None
+        clone._from_world = None
+        clone._world_bounds = None
+        clone._children_bounds = None
+        clone.sockets = dict(self.sockets)
+        clone.children = {}
+        for name, child in self.children.items():
+            child_clone = child.copy()
+            child_clone.parent = clone
+            clone.children[name] = child_clone
+        return clone
     
+    @staticmethod
+    @cache
+    def _slot_names(cls: type) -> tuple[str, ...]:
+        # NOTE Subclasses that don't declare __slots__ keep a __dict__, which copy() handles separately.
+        slot_names = []
+        for base in cls.__mro__:
+            slots = base.__dict__.get("__slots__", ())
+            slots = (slots,) if isinstance(slots, str) else slots
+            slot_names.extend(slot for slot in slots if slot not in ("__dict__", "__weakref__"))
+        return tuple(slot_names)
+
     def child(self, name: str) -> "Component":
         return self.children[name]
     
     def add_child(self, name: str, child: "Component") -> None:
         child.parent = self
         self.children[name] = child
+        child._invalidate()
+
+    def remove_child(self, name: str) -> None:
+        child = self.children.pop(name)
+        child.parent = None
+        child._invalidate_to_world()
+        self._invalidate_bounds()
     
     def connect(self, child1: str, socket1: str, child2: str, socket2: str) -> None:
         from Domino.components.curve_domino import CurveDomino
@@ -135,15 +257,57 @@ class Component:
             raise ValueError(f"unsupported socket type: {type(socket)}")
         self.sockets[socket_name] = (position, direction)
 
+    @property
+    def to_parent(self) -> Pose:
+        return self._to_parent
+
+    @to_parent.setter
+    def to_parent(self, to_parent: Pose) -> None:
+        self._to_parent = to_parent
+        self._invalidate()
+
+    def _invalidate(self) -> None:
+        # Called whenever to_parent changes: the subtree moves in world, and so do the bounds of all ancestors.
+        self._invalidate_to_world()
+        if self.parent is not None:
+            self.parent._invalidate_bounds()
+
+    def _invalidate_to_world(self) -> None:
+        # NOTE A cached node always has cached ancestors, so once a stale node is reached its subtree is stale too.
+        if self._to_world is None:
+            return
+        self._to_world = None
+        self._from_world = None
+        self._world_bounds = None
+        self._children_bounds = None
+        for child in self.children.values():
+            child._invalidate_to_world()
+
+    def _invalidate_bounds(self) -> None:
+        # NOTE Cached bounds always have cached children bounds, so once a stale node is reached its ancestors are stale too.
+        component = self
+        while component is not None and component._world_bounds is not None:
+            component._world_bounds = None
+            component._children_bounds = None
+            component = component.parent
+
     def to_world(self) -> Pose:
-        if self.parent is None:
-            return self.to_parent
-        return self.parent.to_world() * self.to_parent
+        if self._to_world is None:
+            if self.parent is None:
+                self._to_world = self.to_parent
+            else:
+                self._to_world = self.parent.to_world() * self.to_parent
+        return self._to_world
+
+    def from_world(self) -> Pose:
+        if self._from_world is None:
+            self._from_world = self.to_world().inverse()
+        return self._from_world
     
     def to_other(self, other: "Component | None") -> Pose:
         if other is None:
             return self.to_world()
-        return other.to_world().inverse() * self.to_world()
+        return other.from_world() * self.to_world()
     
     # These method should not be needed.
 
@@ -176,6 +340,7 @@ class Component:
         anchor_in_parent = self.to_parent.apply_vector(self.anchors[anchor])
         target_in_parent = target.to_other(self.parent)
         self.to_parent.set_position(target_in_parent - anchor_in_parent)
+        self._invalidate()
         return self
 
     def move(self, delta: np.ndarray | VectorRef) -> "Component":
@@ -186,6 +351,7 @@ class Component:
         else:
             raise ValueError(f"unsupported delta type: {type(delta)}")
         self.to_parent.set_position(self.to_parent.position + delta_in_parent)
+        self._invalidate()
         return self
     
     def rotate(self, anchor: None | str | np.ndarray | PointRef, axis: str | np.ndarray | VectorRef, angle: float) -> "Component":
@@ -252,27 +418,19 @@ class Component:
             direction_in_world = direction.to_world()
         else:
             raise ValueError(f"unsupported direction type: {type(direction)}")
-        # Resolve target OBBs in world frame.
-        if isinstance(target, Component):
-            target_obbs = [leaf.obb_in_world() for leaf in target.collect_leaves()]
-        elif isinstance(target, list[Component]):
-            target_obbs = []
-            for target_component in target:
-                target_obbs.extend([leaf.obb_in_world() for leaf in target_component.collect_leaves()])
-        else:
-            raise ValueError(f"unsupported target type: {type(target)}")
-        # Find contact distance.
-        contact_distance = None
-        for leaf in self.collect_leaves():
-            leaf_obb = leaf.obb_in_world()
-            for target_obb in target_obbs:
-                target_contact_distance = SAT.slide_distance(leaf_obb, target_obb, direction_in_world)
-                if target_contact_distance is not None and target_contact_distance > 0:
-                    if contact_distance is None or target_contact_distance < contact_distance:
-                        contact_distance = target_contact_distance
+        # Resolve target OBBs in world frame, only those that can be hit along the way.
+        obbs = self.collect_obbs()
+        lower, upper = AABB.union(*AABB.of_obbs(obbs))
+        target_obbs = Component.collect_target_obbs(target, lambda target_lower, target_upper: (
+            AABB.sweep_hits(target_lower, target_upper, lower, upper, direction_in_world)
+        ))
+        # Find contact distance, over all (leaf, target) pairs at once.
+        contact_distances = SAT.slide_distance_batch(obbs, target_obbs, direction_in_world)
+        contact_distances = contact_distances[contact_distances > 0]
+        contact_distance = np.min(contact_distances) if len(contact_distances) > 0 else None
         if contact_distance is not None:
             delta_in_world = contact_distance * direction_in_world
-            delta_local = self.to_world().inverse().apply_vector(delta_in_world)
+            delta_local = self.from_world().apply_vector(delta_in_world)
             self.move(delta_local)
         else:
             logger.warning(f"No contact found or already colliding with target {target}.")
@@ -301,24 +459,14 @@ class Component:
         else:
             raise ValueError(f"unsupported axis type: {type(axis)}")
         axis_in_world = self.to_world().apply_vector(axis_local)
-        # Resolve target OBBs in world frame.
-        if isinstance(target, Component):
-            target_obbs = [leaf.obb_in_world() for leaf in target.collect_leaves()]
-        elif isinstance(target, list[Component]):
-            target_obbs = []
-            for target_component in target:
-                target_obbs.extend([leaf.obb_in_world() for leaf in target_component.collect_leaves()])
-        else:
-            raise ValueError(f"unsupported target type: {type(target)}")
-        # Find contact angle.
-        rotate_angle = None
-        for leaf in self.collect_leaves():
-            leaf_obb = leaf.obb_in_world()
-            for target_obb in target_obbs:
-                target_rotate_angle = SAT.rotate_angle(leaf_obb, target_obb, anchor_in_world, axis_in_world)
-                if target_rotate_angle is not None:
-                    if rotate_angle is None or target_rotate_angle < rotate_angle:
-                        rotate_angle = target_rotate_angle
+        # Resolve target OBBs in world frame, only those within reach of the rotation.
+        obbs = self.collect_obbs()
+        lower, upper = AABB.rotation_bounds(obbs, anchor_in_world, axis_in_world)
+        target_obbs = Component.collect_target_obbs(target, lambda target_lower, target_upper: (
+            AABB.overlap_hits(target_lower, target_upper, lower, upper)
+        ))
+        # Find contact angle, over all (leaf, target) pairs at once.
+        rotate_angle = SAT.rotate_angle_batch(obbs, target_obbs, anchor_in_world, axis_in_world)
         if rotate_angle is not None:
             self.rotate(anchor, axis, rotate_angle)
         else:
@@ -333,3 +481,98 @@ class Component:
             for child in self.children.values():
                 leaves.extend(child.collect_leaves())
         return leaves
+
+    def obbs_in_world(self) -> OBBArray:
+        # Collision geometry of a leaf, a leaf type may hold any number of boxes.
+        return OBBArray.stack([self.obb_in_world()])
+
+    def collect_obbs(self) -> OBBArray:
+        return Component.leaves_obbs(self.collect_leaves())[0]
+
+    @staticmethod
+    def leaves_obbs(leaves: list["Component"]) -> tuple[OBBArray, np.ndarray]:
+        # Boxes of all leaves, and for each box the index of its leaf. Single box leaves are stacked in one go.
+        single_obbs, single_owners = [], []
+        obb_arrays, owners = [], []
+        for index, leaf in enumerate(leaves):
+            if type(leaf).obbs_in_world is Component.obbs_in_world:
+                single_obbs.append(leaf.obb_in_world())
+                single_owners.append(index)
+            else:
+                leaf_obbs = leaf.obbs_in_world()
+                obb_arrays.append(leaf_obbs)
+                owners.append(np.full(len(leaf_obbs), index))
+        obb_arrays.insert(0, OBBArray.stack(single_obbs))
+        owners.insert(0, np.array(single_owners, dtype=int))
+        return OBBArray.concatenate(obb_arrays), np.concatenate(owners)
+
+    @staticmethod
+    def leaves_bounds(leaves: list["Component"]) -> np.ndarray:
+        # (L, 2, 3) world bounds of each leaf.
+        obbs, owners = Component.leaves_obbs(leaves)
+        lower, upper = AABB.of_obbs(obbs)
+        bounds = np.empty((len(leaves), 2, 3))
+        bounds[:, 0], bounds[:, 1] = np.inf, -np.inf
+        np.minimum.at(bounds[:, 0], owners, lower)
+        np.maximum.at(bounds[:, 1], owners, upper)
+        return bounds
+
+    def world_bounds(self) -> tuple[np.ndarray, np.ndarray]:
+        # Axis aligned bounds of all leaf boxes in world frame, cached until the subtree moves or changes.
+        if self._world_bounds is None:
+            if len(self.children) == 0:
+                bounds = Component.leaves_bounds([self])[0]
+            else:
+                children_bounds = self.children_bounds()
+                bounds = AABB.union(children_bounds[:, 0], children_bounds[:, 1])
+            self._world_bounds = (bounds[0], bounds[1])
+        return self._world_bounds
+
+    def children_bounds(self) -> np.ndarray:
+        # (C, 2, 3) world bounds of each child, where all leaf children are handled in one go.
+        if self._children_bounds is None:
+            children = list(self.children.values())
+            children_bounds = np.empty((len(children), 2, 3))
+            leaf_indices = [index for index, child in enumerate(children) if len(child.children) == 0]
+            if len(leaf_indices) > 0:
+                children_bounds[leaf_indices] = Component.leaves_bounds([children[index] for index in leaf_indices])
+            for index, child in enumerate(children):
+                if len(child.children) > 0:
+                    children_bounds[index] = child.world_bounds()
+            self._children_bounds = children_bounds
+        return self._children_bounds
+
+    def collect_leaves_near(self, hit_test: Callable[[np.ndarray, np.ndarray], np.ndarray]) -> list["Component"]:
+        """
+        Like collect_leaves(), but only leaves whose world bounds pass hit_test(lower, upper), which maps (K, 3)
+        lower and upper corners to a (K,) mask. Subtrees whose bounds fail are skipped without being visited, so the
+        cost scales with the number of nearby leaves instead of the size of the tree.
+        """
+        lower, upper = self.world_bounds()
+        if not hit_test(lower[np.newaxis], upper[np.newaxis])[0]:
+            return []
+        if len(self.children) == 0:
+            return [self]
+        leaves = []
+        children = list(self.children.values())
+        children_bounds = self.children_bounds()
+        for index in np.flatnonzero(hit_test(children_bounds[:, 0], children_bounds[:, 1])):
+            child = children[index]
+            leaves.extend([child] if len(child.children) == 0 else child.collect_leaves_near(hit_test))
+        return leaves
+
+    @staticmethod
+    def collect_target_obbs(target: "Component | list[Component]", hit_test: Callable[[np.ndarray, np.ndarray], np.ndarray] | None = None) -> OBBArray:
+        if isinstance(target, Component):
+            targets = [target]
+        elif isinstance(target, list):
+            targets = target
+        else:
+            raise ValueError(f"unsupported target type: {type(target)}")
+        leaves = []
+        for target_component in targets:
+            if hit_test is None:
+                leaves.extend(target_component.collect_leaves())
+            else:
+                leaves.extend(target_component.collect_leaves_near(hit_test))
+        return Component.leaves_obbs(leaves)[0]
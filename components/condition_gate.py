@@ -6,6 +6,7 @@ from Domino.components.pile_domino import PileDomino
 from Domino.components.ground import Ground
 
 class ConditionGate(Component):
+    CACHE_PROTOTYPE = True
     def __init__(self):
         super().__init__()
         self.add_child("base", (
@@ -52,7 +53,7 @@ class ConditionGate(Component):
             .place("x-z-", self.child("temp").anchor("x+z+"))
             .move(np.array([Domino.SIZE[0], 0, 0]))
         ))
-        del self.children["temp"]
+        self.remove_child("temp")
 
         self.add_socket("in", "in")
         self.add_socket("out", "out")
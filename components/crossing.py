@@ -6,6 +6,7 @@ from Domino.components.impulse_trigger import ImpulseTrigger
 
 
 class Crossing(Component):
+    CACHE_PROTOTYPE = True
     def __init__(self):
         super().__init__()
         self.add_child("base_shaft", (
@@ -1,10 +1,19 @@
 import numpy as np
 
-from Domino.components.component import Component, SocketRef
+from Domino.components.component import SocketRef
 from Domino.components.domino import Domino
+from Domino.components.domino_array import DominoArray
+
+
+# Nodes and weights of Gauss-Legendre quadrature on [-1, 1].
+GAUSS_LEGENDRE_NODES, GAUSS_LEGENDRE_WEIGHTS = np.polynomial.legendre.leggauss(8)
 
 
 class CubicBezier:
+    ARC_LENGTH_TOLERANCE = 1e-7
+    MAX_SUBDIVISIONS = 16
+    MAX_INVERSE_ITERATIONS = 32
+
     def __init__(self, control_points: list[np.ndarray]):
         if len(control_points) != 4:
             raise ValueError("CubicBezier can only support 4 control points")
@@ -29,16 +38,71 @@ class CubicBezier:
 
     def evaluate(self, t: float | np.ndarray) -> np.ndarray:
         if isinstance(t, np.ndarray):
-            t = t[:, np.newaxis]
+            t = t[..., np.newaxis]
         return self.control_points[0] * (1 - t) ** 3 + 3 * self.control_points[1] * t * (1 - t) ** 2 + 3 * self.control_points[2] * t ** 2 * (1 - t) + self.control_points[3] * t ** 3
 
     def derivative(self, t: float | np.ndarray) -> np.ndarray:
         if isinstance(t, np.ndarray):
-            t = t[:, np.newaxis]
+            t = t[..., np.newaxis]
         return 3 * (self.control_points[1] - self.control_points[0]) * (1 - t) ** 2 + 6 * (self.control_points[2] - self.control_points[1]) * t * (1 - t) + 3 * (self.control_points[3] - self.control_points[2]) * t ** 2
 
 
-class CurveDomino(Component):
+    def speed(self, t: float | np.ndarray) -> float | np.ndarray:
+        return np.linalg.norm(self.derivative(t), axis=-1)
+
+    def segment_lengths(self, t0: np.ndarray, t1: np.ndarray) -> np.ndarray:
+        # Arc length over each [t0, t1] by Gauss-Legendre quadrature of the speed.
+        half_span = (t1 - t0) / 2
+        t = ((t0 + t1) / 2)[..., np.newaxis] + half_span[..., np.newaxis] * GAUSS_LEGENDRE_NODES
+        return half_span * (self.speed(t) @ GAUSS_LEGENDRE_WEIGHTS)
+
+    def arc_length_table(self, tolerance: float = ARC_LENGTH_TOLERANCE) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Returns breakpoints (K,) in t and the cumulative arc length (K,) at each of them. Intervals are split where
+        the quadrature over the whole and over the two halves disagree, i.e. where the speed changes quickly in tight
+        bends, so that gentle curves need only a few evaluations.
+        """
+        breakpoints = np.linspace(0, 1, 5)
+        for _ in range(CubicBezier.MAX_SUBDIVISIONS):
+            t0, t1 = breakpoints[:-1], breakpoints[1:]
+            t_middle = (t0 + t1) / 2
+            whole = self.segment_lengths(t0, t1)
+            halves = self.segment_lengths(t0, t_middle) + self.segment_lengths(t_middle, t1)
+            # NOTE The tolerance is spread over t, so the total error stays below it however many intervals.
+            unconverged = np.abs(whole - halves) > tolerance * (t1 - t0)
+            if not np.any(unconverged):
+                break
+            breakpoints = np.sort(np.concatenate([breakpoints, t_middle[unconverged]]))
+        lengths = self.segment_lengths(breakpoints[:-1], breakpoints[1:])
+        return breakpoints, np.concatenate([[0], np.cumsum(lengths)])
+
+    def t_at_lengths(self, lengths: np.ndarray, arc_length_table: tuple[np.ndarray, np.ndarray] | None = None, tolerance: float = ARC_LENGTH_TOLERANCE) -> np.ndarray:
+        # Inverts the arc length by safeguarded Newton steps, falling back to bisection inside the bracketing interval.
+        if arc_length_table is None:
+            arc_length_table = self.arc_length_table(tolerance)
+        breakpoints, cumulative_lengths = arc_length_table
+        lengths = np.clip(np.asarray(lengths, dtype=float), 0, cumulative_lengths[-1])
+        intervals = np.clip(np.searchsorted(cumulative_lengths, lengths, side="right") - 1, 0, len(breakpoints) - 2)
+        lower, upper = breakpoints[intervals], breakpoints[intervals + 1]
+        interval_start = lower
+        remaining = lengths - cumulative_lengths[intervals]
+        interval_lengths = cumulative_lengths[intervals + 1] - cumulative_lengths[intervals]
+        t = lower + (upper - lower) * np.divide(remaining, interval_lengths, out=np.zeros_like(remaining), where=interval_lengths > 0)
+        for _ in range(CubicBezier.MAX_INVERSE_ITERATIONS):
+            error = self.segment_lengths(interval_start, t) - remaining
+            if np.all(np.abs(error) <= tolerance):
+                break
+            lower = np.where(error < 0, t, lower)
+            upper = np.where(error > 0, t, upper)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                t_newton = t - error / self.speed(t)
+            outside = ~((t_newton > lower) & (t_newton < upper))
+            t = np.where(np.abs(error) <= tolerance, t, np.where(outside, (lower + upper) / 2, t_newton))
+        return t
+
+
+class CurveDomino(DominoArray):
+    __slots__ = ("bezier",)
     DEFAULT_GAP = Domino.SIZE[2] * 0.75
 
     def __init__(self, start: SocketRef, end: SocketRef, include: tuple[bool, bool] = (False, False), gap_ratio: float = 1.0):
@@ -52,49 +116,21 @@ class CurveDomino(Component):
             end_position_in_world,
             end_direction_in_world
         )
-        # Resolve gap and count.
+        # Resolve gap and count, along the curve laid flat on the ground.
+        ground_curve = CubicBezier([point * np.array([1, 1, 0]) for point in self.bezier.control_points])
+        arc_length_table = ground_curve.arc_length_table()
+        length = arc_length_table[1][-1]
         desired_gap = gap_ratio * self.DEFAULT_GAP
-        # Use 5x here, so that don't need to handle multiple dominoes in one gap.
-        straight_length = np.linalg.norm(end_position_in_world - start_position_in_world)
-        sample_count = 5 * int(np.ceil(straight_length / desired_gap))
-        sample_t = np.linspace(0, 1, sample_count)
-        sample_points = self.bezier.evaluate(sample_t)
-        sample_points = np.stack([sample_points[:, 0], sample_points[:, 1], np.zeros(sample_count)], axis=1)
-        discrete_length = np.sum(np.linalg.norm(sample_points[1:] - sample_points[:-1], axis=1))
-        sample_directions = self.bezier.derivative(sample_t)
-        sample_directions = sample_directions / np.linalg.norm(sample_directions, axis=1, keepdims=True)
-        sample_yaws = np.arctan2(sample_directions[:, 1], sample_directions[:, 0])
-        gap_count = int(np.ceil(discrete_length / desired_gap))
-        gap = discrete_length / gap_count
-        # Place dominoes.
-        domino_count = 0
+        gap_count = int(np.ceil(length / desired_gap))
+        gap = length / gap_count
+        lengths = gap * np.arange(1, gap_count)
         if include[0]:
-            self.add_child(f"{domino_count}", (
-                Domino().standing()
-                .place("z-", self.anchor(sample_points[0]))
-                .rotate("", "z+", sample_yaws[0])
-            ))
-            domino_count += 1
-        budget = 0
-        for i in range(1, sample_count - 1):
-            segment_length = np.linalg.norm(sample_points[i] - sample_points[i - 1])
-            budget += segment_length
-            if budget > gap:
-                # Lerp position and yaw.
-                blend = 1 - (budget - gap) / segment_length
-                position = sample_points[i - 1] + blend * (sample_points[i] - sample_points[i - 1])
-                yaw = sample_yaws[i - 1] + blend * (sample_yaws[i] - sample_yaws[i - 1])
-                self.add_child(f"{domino_count}", (
-                    Domino().standing()
-                    .place("z-", self.anchor(position))
-                    .rotate("", "z+", yaw)
-                ))
-                budget -= gap
-                domino_count += 1
+            lengths = np.concatenate([[0], lengths])
         if include[1]:
-            self.add_child(f"{domino_count}", (
-                Domino().standing()
-                .place("z-", self.anchor(sample_points[-1]))
-                .rotate("", "z+", sample_yaws[-1])
-            ))
-            domino_count += 1
+            lengths = np.concatenate([lengths, [length]])
+        # Place dominoes, facing along the tangent.
+        t = ground_curve.t_at_lengths(lengths, arc_length_table)
+        positions = ground_curve.evaluate(t)
+        directions = ground_curve.derivative(t)
+        yaws = np.arctan2(directions[:, 1], directions[:, 0])
+        self.set_standing(positions, yaws)
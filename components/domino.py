@@ -1,6 +1,6 @@
 import numpy as np
 
-from Domino.components.component import Component, PointRef, VectorRef
+from Domino.components.component import AnchorTable, Component, PointRef, VectorRef
 from Domino.geometry.pose import Pose, rotation_matrix_from_rpy
 from Domino.geometry.collision import OBB, SAT
 from Domino.components.ground import Ground
@@ -21,17 +21,17 @@ Default local coordinate system:
 +------------------+
 """
 class Domino(Component):
+    __slots__ = ()
     SIZE = np.array([0.015, 0.05, 0.1])
     LEAN_ANGLE = np.arctan(SIZE[0] / SIZE[2]) + 1.0E-2
-
-    def __init__(self, to_parent: Pose | None = None):
-        super().__init__(to_parent)
-        for sign_x, label_x in [(-1, "x-"), (0, ""), (1, "x+")]:
-            for sign_y, label_y in [(-1, "y-"), (0, ""), (1, "y+")]:
-                for sign_z, label_z in [(-1, "z-"), (0, ""), (1, "z+")]:
-                    anchor_name = f"{label_x}{label_y}{label_z}"
-                    anchor_position_local = np.array([sign_x, sign_y, sign_z]) * self.SIZE / 2
-                    self.anchors[anchor_name] = anchor_position_local
+    ANCHORS = AnchorTable.box(SIZE)
+    # Sockets of a standing domino in its own frame, the reversed ones belong to the same domino turned around z.
+    STANDING_SOCKETS = {
+        "in": (np.array([0, 0, 0]), np.array([1, 0, 0])),
+        "out": (np.array([0, 0, 0]), np.array([1, 0, 0])),
+        "in_reversed": (np.array([0, 0, 0]), np.array([-1, 0, 0])),
+        "out_reversed": (np.array([0, 0, 0]), np.array([-1, 0, 0])),
+    }
 
     @staticmethod
     def from_rpy(roll: float = 0.0, pitch: float = 0.0, yaw: float = 0.0) -> "Domino":
@@ -42,11 +42,7 @@ class Domino(Component):
     def standing(yaw: float = 0.0) -> "Domino":
         rotation = rotation_matrix_from_rpy(0, 0, yaw)
         domino = Domino(Pose(rotation=rotation))
-        domino.add_socket("in", domino)
-        domino.add_socket("out", domino)
-        domino_reversed = domino.copy().rotate("", "z+", np.pi)
-        domino.add_socket("in_reversed", domino_reversed)
-        domino.add_socket("out_reversed", domino_reversed)
+        domino.sockets = dict(Domino.STANDING_SOCKETS)
         return domino
 
     @staticmethod
@@ -0,0 +1,74 @@
+import numpy as np
+
+from Domino.components.component import Component
+from Domino.components.domino import Domino
+from Domino.geometry.pose import Pose, PoseArray, rotation_matrix_from_rpy
+from Domino.geometry.collision import OBBArray
+
+
+class DominoArrayElement(Domino):
+    """
+    A `Domino` view of one element of a `DominoArray`, returned by `DominoArray.child()`. Moving the view writes its
+    pose back into the array. Views are not kept by the array, so take a new one after moving another view of the
+    same element.
+    """
+    __slots__ = ("index",)
+
+    def _invalidate(self) -> None:
+        array = self.parent
+        if not isinstance(array, DominoArray):
+            # NOTE A copy of the view is detached, and is just a domino from then on.
+            super()._invalidate()
+            return
+        # NOTE Copy on write, since copies of an array share its pose arrays.
+        positions, rotations = array.positions.copy(), array.rotations.copy()
+        positions[self.index], rotations[self.index] = self.to_parent.position, self.to_parent.rotation
+        array.positions, array.rotations = positions, rotations
+        self._invalidate_to_world()
+        array._invalidate_bounds()
+
+
+class DominoArray(Component):
+    """
+    A single leaf holding N standing dominoes as (N, 3) positions and (N, 3, 3) rotations relative to itself, instead
+    of N `Domino` children. Element i is named str(first_index + i): it is reachable as a `Domino` view through
+    child(), and compiles into its own body with path "<array path>/<first_index + i>".
+    """
+    __slots__ = ("positions", "rotations", "first_index")
+
+    def __init__(self, to_parent: Pose | None = None):
+        super().__init__(to_parent)
+        self.positions = np.zeros((0, 3))
+        self.rotations = np.zeros((0, 3, 3))
+        self.first_index = 0
+
+    def set_standing(self, bottom_positions: np.ndarray, yaws: np.ndarray, first_index: int = 0) -> "DominoArray":
+        # Each element like Domino.standing(yaw).place("z-", ...), for (N, 3) bottom centers and (N,) yaws relative to self.
+        self.positions = np.asarray(bottom_positions, dtype=float).reshape(-1, 3) + np.array([0, 0, Domino.SIZE[2] / 2])
+        self.rotations = rotation_matrix_from_rpy(0, 0, np.asarray(yaws, dtype=float)).reshape(-1, 3, 3)
+        self.first_index = first_index
+        self._invalidate_bounds()
+        return self
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    @property
+    def poses(self) -> PoseArray:
+        return PoseArray(self.positions, self.rotations)
+
+    def element_names(self) -> list[str]:
+        return [f"{self.first_index + index}" for index in range(len(self))]
+
+    def child(self, name: str) -> DominoArrayElement:
+        index = int(name) - self.first_index
+        if not 0 <= index < len(self):
+            raise KeyError(name)
+        element = DominoArrayElement(Pose(self.positions[index], self.rotations[index]))
+        element.sockets = dict(Domino.STANDING_SOCKETS)
+        element.parent = self
+        element.index = index
+        return element
+
+    def obbs_in_world(self) -> OBBArray:
+        return OBBArray(self.to_world() * self.poses, Domino.SIZE / 2)
@@ -4,6 +4,7 @@ from Domino.components.component import Component
 from Domino.components.domino import Domino
 
 class ElegantAndGate(Component):
+    CACHE_PROTOTYPE = True
     def __init__(self):
         super().__init__()
         self.add_child("trap", (
@@ -6,6 +6,7 @@ from Domino.geometry.collision import OBB
 
 
 class Ground(Component):
+    __slots__ = ()
     _instance = None
     HALF_SIZE = np.array([10, 10, 1])
     
@@ -14,6 +15,9 @@ class Ground(Component):
             cls._instance = super().__new__(cls)
         return cls._instance
     
+    def copy(self) -> "Ground":
+        return self
+
     def to_world(self) -> Pose:
         return Pose(position=np.array([0, 0, -Ground.HALF_SIZE[2]]))
     
@@ -6,6 +6,7 @@ from Domino.components.ground import Ground
 
 
 class ImpulseTrigger(Component):
+    CACHE_PROTOTYPE = True
     EDGE_HANG = Domino.SIZE[0] * 0.4
     SHRINK_GAP_ITERATIONS = 3
 
@@ -41,6 +42,6 @@ class ImpulseTrigger(Component):
             .move_to_touch(self.axis("z-"), Ground())
             .move(self.axis(np.array([Domino.SIZE[0], 0, 0])))
         ))
-        del self.children["temp"]
+        self.remove_child("temp")
         self.add_socket("in", self.child("trigger").socket("in_reversed"))
         self.add_socket("out", "trigger")
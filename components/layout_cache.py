@@ -0,0 +1,193 @@
+import os
+import sys
+import hashlib
+import importlib
+import zipfile
+from pathlib import Path
+import logging
+logger = logging.getLogger(__name__)
+
+import numpy as np
+
+from Domino.geometry.pose import Pose
+from Domino.components.component import AnchorTable, Component, ComponentMeta
+from Domino.components.domino import Domino
+
+
+class LayoutCache:
+    """
+    On-disk cache of solved prototype layouts, one .npz file per component class and constructor arguments. Each file
+    stores every node of the prototype subtree in pre-order: path, class, to_parent, sockets, anchors if not the class
+    table, and extra attributes such as `PileDomino.pile_count`. A file is only used while its signature still
+    matches: the key, `Domino.SIZE`, and the source of the core modules and of every module its classes come from.
+    """
+    CORE_MODULES = [
+        "Domino.components.component",
+        "Domino.components.domino",
+        "Domino.components.ground",
+        "Domino.geometry.pose",
+        "Domino.geometry.collision",
+    ]
+    ATTRIBUTE_TYPES = (bool, int, float, str, np.ndarray)
+
+    def __init__(self, cache_dir: str | Path):
+        self.cache_dir = Path(cache_dir)
+        self._module_hashes = {}
+
+    def module_hash(self, module_name: str) -> str:
+        if module_name not in self._module_hashes:
+            if module_name not in sys.modules:
+                importlib.import_module(module_name)
+            with open(sys.modules[module_name].__file__, "rb") as file:
+                self._module_hashes[module_name] = hashlib.sha256(file.read()).hexdigest()
+        return self._module_hashes[module_name]
+
+    @staticmethod
+    def key(cls: type, args: tuple, kwargs: dict) -> str:
+        return f"{cls.__module__}:{cls.__qualname__}{args!r}{sorted(kwargs.items())!r}"
+
+    def path(self, key: str) -> Path:
+        class_name = key.split(":")[1].split("(")[0]
+        return self.cache_dir / f"{class_name}-{hashlib.sha256(key.encode()).hexdigest()[:16]}.npz"
+
+    def signature(self, key: str, module_names: list[str]) -> np.ndarray:
+        # (M, 2) rows of (name, value) that must all match for a file to be used.
+        rows = [["key", key], ["Domino.SIZE", hashlib.sha256(Domino.SIZE.tobytes()).hexdigest()]]
+        for module_name in sorted(set(LayoutCache.CORE_MODULES) | set(module_names)):
+            rows.append([module_name, self.module_hash(module_name)])
+        return np.array(rows)
+
+    def load(self, cls: type, args: tuple, kwargs: dict) -> Component | None:
+        key = LayoutCache.key(cls, args, kwargs)
+        path = self.path(key)
+        if not path.exists():
+            return None
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                signature = data["signature"]
+                module_names = [str(name) for name in signature[2:, 0]]
+                if not np.array_equal(signature, self.signature(key, module_names)):
+                    return None
+                return LayoutCache.unpack(data)
+        except (OSError, KeyError, ValueError, AttributeError, ImportError, zipfile.BadZipFile) as error:
+            logger.warning(f"ignoring unreadable layout cache file {path}: {error}")
+            return None
+
+    def save(self, cls: type, args: tuple, kwargs: dict, component: Component) -> None:
+        key = LayoutCache.key(cls, args, kwargs)
+        if " at 0x" in key:
+            # NOTE Arguments without a stable repr can't be matched across runs.
+            return
+        arrays = LayoutCache.pack(component)
+        if arrays is None:
+            return
+        module_names = [str(node_class).split(":")[0] for node_class in arrays["nodes"][:, 1]]
+        arrays["signature"] = self.signature(key, module_names)
+        path = self.path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # NOTE Write then rename, so that concurrent runs never read a partial file.
+        temp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(temp_path, "wb") as file:
+            np.savez(file, **arrays)
+        os.replace(temp_path, path)
+
+    @staticmethod
+    def state_attributes(component: Component) -> dict:
+        # Instance state on top of Component's own slots, e.g. PileDomino.pile_count.
+        attributes = {}
+        for slot in Component._slot_names(type(component)):
+            if slot not in Component.__slots__ and hasattr(component, slot):
+                attributes[slot] = getattr(component, slot)
+        attributes.update(getattr(component, "__dict__", {}))
+        return attributes
+
+    @staticmethod
+    def pack(root: Component) -> dict[str, np.ndarray] | None:
+        # Returns None if some node can't be restored from arrays, e.g. Ground, which overrides copy().
+        # NOTE Empty groups are left out, every array read from a .npz has a fixed cost.
+        arrays = {}
+        nodes, node_to_parent = [], []
+        sockets, socket_frames = [], []
+        anchors, anchor_positions = [], []
+        attributes = []
+        stack = [("", root)]
+        while len(stack) > 0:
+            path, node = stack.pop()
+            if type(node).copy is not Component.copy:
+                return None
+            index = len(nodes)
+            nodes.append((path, f"{type(node).__module__}:{type(node).__qualname__}"))
+            node_to_parent.append(np.column_stack([node.to_parent.rotation, node.to_parent.position]))
+            for name, (position, direction) in node.sockets.items():
+                sockets.append((index, name))
+                socket_frames.append((position, direction))
+            if node.anchors is not type(node).ANCHORS:
+                for name in node.anchors.keys():
+                    anchors.append((index, name))
+                    anchor_positions.append(node.anchors[name])
+            for name, value in LayoutCache.state_attributes(node).items():
+                if not isinstance(value, LayoutCache.ATTRIBUTE_TYPES):
+                    return None
+                arrays[f"attribute_{len(attributes)}"] = np.asarray(value)
+                attributes.append((index, name))
+            prefix = "" if path == "" else f"{path}/"
+            for name, child in reversed(node.children.items()):
+                stack.append((f"{prefix}{name}", child))
+        arrays["nodes"] = np.array(nodes)
+        arrays["node_to_parent"] = np.array(node_to_parent, dtype=float)
+        if len(sockets) > 0:
+            arrays["sockets"] = np.array(sockets)
+            arrays["socket_frames"] = np.array(socket_frames, dtype=float)
+        if len(anchors) > 0:
+            arrays["anchors"] = np.array(anchors)
+            arrays["anchor_positions"] = np.array(anchor_positions, dtype=float)
+        if len(attributes) > 0:
+            arrays["attributes"] = np.array(attributes)
+        return arrays
+
+    @staticmethod
+    def unpack(data: dict[str, np.ndarray]) -> Component:
+        nodes, nodes_by_path = [], {}
+        for (path, node_class), to_parent in zip(data["nodes"], data["node_to_parent"]):
+            path = str(path)
+            module_name, class_name = str(node_class).split(":")
+            cls = sys.modules[module_name]
+            for name in class_name.split("."):
+                cls = getattr(cls, name)
+            node = object.__new__(cls)
+            node.parent = None
+            node._to_parent = Pose(to_parent[:, 3], to_parent[:, :3])
+            node._to_world = None
+            node._from_world = None
+            node._world_bounds = None
+            node._children_bounds = None
+            node.children = {}
+            node.anchors = cls.ANCHORS
+            node.sockets = {}
+            if path != "":
+                parent_path, _, name = path.rpartition("/")
+                node.parent = nodes_by_path[parent_path]
+                node.parent.children[name] = node
+            nodes_by_path[path] = node
+            nodes.append(node)
+        if "sockets" in data:
+            for (index, name), (position, direction) in zip(data["sockets"], data["socket_frames"]):
+                nodes[int(index)].sockets[str(name)] = (position, direction)
+        if "anchors" in data:
+            anchor_tables = {}
+            for (index, name), position in zip(data["anchors"], data["anchor_positions"]):
+                names, positions = anchor_tables.setdefault(int(index), ([], []))
+                names.append(str(name))
+                positions.append(position)
+            for index, (names, positions) in anchor_tables.items():
+                nodes[index].anchors = AnchorTable(names, np.array(positions))
+        if "attributes" in data:
+            for attribute, (index, name) in enumerate(data["attributes"]):
+                value = data[f"attribute_{attribute}"]
+                setattr(nodes[int(index)], str(name), value.item() if value.ndim == 0 else value)
+        return nodes[0]
+
+
+def enable_layout_cache(cache_dir: str | Path | None) -> None:
+    # Pass None to disable.
+    ComponentMeta.layout_cache = LayoutCache(cache_dir) if cache_dir is not None else None
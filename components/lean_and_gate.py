@@ -6,6 +6,7 @@ from Domino.components.pile_domino import PileDomino
 
 
 class LeanAndGate(Component):
+    CACHE_PROTOTYPE = True
     def __init__(self):
         super().__init__()
         half_width = Domino.SIZE[1] / 2
@@ -1,10 +1,12 @@
 import numpy as np
 
-from Domino.components.component import Component, PointRef, SocketRef
+from Domino.components.component import PointRef, SocketRef
 from Domino.components.domino import Domino
+from Domino.components.domino_array import DominoArray
 
 
-class LineDomino(Component):
+class LineDomino(DominoArray):
+    __slots__ = ()
     DEFAULT_GAP = Domino.SIZE[2] * 0.75
     
     def __init__(self, start: PointRef, end: PointRef, include: tuple[bool, bool] = (True, True), gap_ratio: float = 1.0, fishbone_angle: float = 0.0):
@@ -21,22 +23,12 @@ class LineDomino(Component):
         if gap_count <= 1 and not include[0] and not include[1]:
             raise ValueError(f"length {length} is too short to create a line domino with gap ratio {gap_ratio}")
         # Place dominoes.
-        indices = list(range(1, gap_count))
-        if include[0]:
-            indices.insert(0, 0)
-        if include[1]:
-            indices.append(gap_count)
-        for index in indices:
-            position_2d = start_local + (end_local - start_local) * index / gap_count
-            position_3d = np.array([position_2d[0], position_2d[1], 0])
-            delta_yaw = 0
-            if index != 0 and index != gap_count:
-                delta_yaw = fishbone_angle if index % 2 == 0 else -fishbone_angle
-            self.add_child(f"{index}", (
-                Domino().standing()
-                .rotate("", np.array([0, 0, 1]), yaw + delta_yaw)
-                .place("z-", self.anchor(position_3d))
-            ))
+        indices = np.arange(0 if include[0] else 1, gap_count + 1 if include[1] else gap_count)
+        positions_2d = start_local + (end_local - start_local) * (indices / gap_count)[:, np.newaxis]
+        positions_3d = np.column_stack([positions_2d, np.zeros(len(indices))])
+        delta_yaws = np.where(indices % 2 == 0, fishbone_angle, -fishbone_angle)
+        delta_yaws[(indices == 0) | (indices == gap_count)] = 0
+        self.set_standing(positions_3d, yaw + delta_yaws, int(indices[0]))
         self.add_socket("in", self.child(f"{indices[0]}").socket("in"))
         self.add_socket("out", self.child(f"{indices[-1]}").socket("out"))
 
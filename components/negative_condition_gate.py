@@ -6,6 +6,7 @@ from Domino.components.pile_domino import PileDomino
 
 
 class NegativeConditionGate(Component):
+    CACHE_PROTOTYPE = True
     def __init__(self):
         super().__init__()
         self.add_child("pile", (
@@ -54,9 +55,9 @@ class NegativeConditionGate(Component):
             Domino.standing()
             .place("x-", self.child("temp_3").anchor("x+"))
         ))
-        del self.children["temp_1"]
-        del self.children["temp_2"]
-        del self.children["temp_3"]
+        self.remove_child("temp_1")
+        self.remove_child("temp_2")
+        self.remove_child("temp_3")
         self.add_socket("in", "in")
         self.add_socket("out", "out")
         self.add_socket("condition", "pillar")
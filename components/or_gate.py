@@ -5,6 +5,7 @@ from Domino.components.domino import Domino
 
 
 class OrGate(Component):
+    CACHE_PROTOTYPE = True
     def __init__(self):
         super().__init__()
         self.add_child("out", (
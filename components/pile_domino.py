@@ -1,10 +1,15 @@
 import numpy as np
 
-from Domino.components.component import Component, PointRef, VectorRef
+from Domino.components.component import AnchorTable, Component, PointRef, VectorRef
 from Domino.components.domino import Domino
 
 
 class PileDomino(Component):
+    __slots__ = ("pile_count", "size")
+    CACHE_PROTOTYPE = True
+    # Anchor tables by pile_count, shared by all piles of the same height.
+    _anchor_tables: dict[int, AnchorTable] = {}
+
     def __init__(self, pile_count: int):
         super().__init__()
         if pile_count <= 0:
@@ -12,18 +17,15 @@ class PileDomino(Component):
         self.pile_count = pile_count
         self.size = np.array([Domino.SIZE[2], Domino.SIZE[1], Domino.SIZE[0] * pile_count])
         self.add_child("0", (
-            Domino().lying()
+            Domino.lying()
             .place("x+", self.anchor(""))
         ))
         for i in range(1, pile_count):
             self.add_child(f"{i}", (
-                Domino().lying()
+                Domino.lying()
                 .place("x+", self.child(f"{i - 1}").anchor("x-"))
             ))
-        for sign_x, label_x in [(-1, "x-"), (0, ""), (1, "x+")]:
-            for sign_y, label_y in [(-1, "y-"), (0, ""), (1, "y+")]:
-                # NOTE PileDomino's origin is at bottom center.
-                for sign_z, label_z in [(0, "z-"), (1, ""), (2, "z+")]:
-                    anchor_name = f"{label_x}{label_y}{label_z}"
-                    anchor_position_local = np.array([sign_x, sign_y, sign_z]) * self.size / 2
-                    self.anchors[anchor_name] = anchor_position_local
+        # NOTE PileDomino's origin is at bottom center.
+        if pile_count not in PileDomino._anchor_tables:
+            PileDomino._anchor_tables[pile_count] = AnchorTable.box(self.size, np.array([0, 0, self.size[2] / 2]))
+        self.anchors = PileDomino._anchor_tables[pile_count]
@@ -6,6 +6,7 @@ from Domino.components.ground import Ground
 
 
 class SideBranch(Component):
+    CACHE_PROTOTYPE = True
     def __init__(self):
         super().__init__()
         self.add_child("in", (
@@ -6,27 +6,28 @@ from Domino.components.ground import Ground
 
 
 class UTurn(Component):
+    CACHE_PROTOTYPE = True
     def __init__(self):
         super().__init__()
         self.add_child("base", (
-            Domino().sideways(np.pi / 2)
+            Domino.sideways(np.pi / 2)
             .place("y-", self.anchor(""))
         ))
         self.add_child("lever", (
-            Domino().sideways()
+            Domino.sideways()
             .place("y-", self.child("base").anchor("y+"))
         ))
         self.add_child("pivot", (
-            Domino().standing(np.pi / 2)
+            Domino.standing(np.pi / 2)
             .place("y+z-", self.child("lever").anchor("x+y-"))
         ))
         self.add_child("left", (
-            Domino().standing()
+            Domino.standing()
             .place("x+z-", self.child("lever").anchor("x-z-"))
             .move_to_touch("z-", Ground())
         ))
         self.add_child("right", (
-            Domino().standing()
+            Domino.standing()
             .place("x+z-", self.child("lever").anchor("x-z+"))
             .move_to_touch("z-", Ground())
         ))
@@ -1,8 +1,13 @@
 import numpy as np
 
-from Domino.geometry.pose import Pose, rotation_matrix_from_axis_angle
+from Domino.geometry.pose import Pose, PoseArray, rotation_matrix_from_axis_angle
 
 CONTACT_EPSILON = 1e-8
+# Angles sampled per batch, and the cap on batches, when solving for a contact angle.
+ROTATE_SAMPLES = 16
+ROTATE_MAX_ITERATIONS = 64
+# Same corner order as looping sign_x, sign_y, sign_z over [-1, 1].
+CORNER_SIGNS = np.array([[sign_x, sign_y, sign_z] for sign_x in [-1, 1] for sign_y in [-1, 1] for sign_z in [-1, 1]])
 
 
 class OBB:
@@ -14,14 +19,10 @@ class OBB:
         return [self.pose.rotation[:, i] for i in range(3)]
     
     def corners(self) -> np.ndarray:
-        corners = []
-        for sign_x in [-1, 1]:
-            for sign_y in [-1, 1]:
-                for sign_z in [-1, 1]:
-                    sign_vector = np.array([sign_x, sign_y, sign_z])
-                    corner = self.pose.apply_point(sign_vector * self.half_extents)
-                    corners.append(corner)
-        return np.array(corners)
+        return self.pose.apply_point(CORNER_SIGNS * self.half_extents)
+
+    def as_array(self) -> "OBBArray":
+        return OBBArray(PoseArray(self.pose.position, self.pose.rotation), self.half_extents)
     
     def radius_along_axis(self, axis: np.ndarray) -> float:
         return np.sum(np.abs(self.pose.rotation.T @ axis) * self.half_extents)
@@ -32,6 +33,115 @@ class OBB:
         return OBB(translation * rotation * translation.inverse() * self.pose, self.half_extents)
 
 
+class OBBArray:
+    def __init__(self, pose: PoseArray, half_extents: np.ndarray):
+        self.pose = pose
+        self.half_extents = np.broadcast_to(np.asarray(half_extents, dtype=float), (len(pose), 3))
+
+    @staticmethod
+    def stack(obbs: list[OBB]) -> "OBBArray":
+        return OBBArray(PoseArray.stack([obb.pose for obb in obbs]), np.array([obb.half_extents for obb in obbs]).reshape(-1, 3))
+
+    @staticmethod
+    def concatenate(obb_arrays: "list[OBBArray]") -> "OBBArray":
+        pose = PoseArray.concatenate([obb_array.pose for obb_array in obb_arrays])
+        if len(obb_arrays) == 0:
+            return OBBArray(pose, np.zeros((0, 3)))
+        return OBBArray(pose, np.concatenate([obb_array.half_extents for obb_array in obb_arrays]))
+
+    def __len__(self) -> int:
+        return len(self.pose)
+
+    def __getitem__(self, index: int | slice | np.ndarray) -> "OBB | OBBArray":
+        if isinstance(index, (int, np.integer)):
+            return OBB(self.pose[index], self.half_extents[index])
+        return OBBArray(self.pose[index], self.half_extents[index])
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def axes(self) -> np.ndarray:
+        # (N, 3, 3), where axes()[n, i] is the i-th axis of the n-th box.
+        return np.swapaxes(self.pose.rotations, -1, -2)
+
+    def corners(self) -> np.ndarray:
+        # (N, 8, 3), in the same order as OBB.corners().
+        corners_local = CORNER_SIGNS * self.half_extents[:, np.newaxis, :]
+        return self.pose.positions[:, np.newaxis, :] + corners_local @ np.swapaxes(self.pose.rotations, -1, -2)
+
+
+class AABB:
+    """
+    Broad phase tests on axis aligned boxes given as (K, 3) lower and upper corner arrays, used to cull candidates
+    before running SAT on them.
+    """
+    @staticmethod
+    def of_obbs(obbs: OBBArray) -> tuple[np.ndarray, np.ndarray]:
+        # (N, 3) lower and upper corners of each box.
+        extents = (np.abs(obbs.pose.rotations) @ obbs.half_extents[:, :, np.newaxis])[..., 0]
+        return obbs.pose.positions - extents, obbs.pose.positions + extents
+
+    @staticmethod
+    def union(lower: np.ndarray, upper: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        return np.min(lower, axis=0), np.max(upper, axis=0)
+
+    @staticmethod
+    def overlap_hits(lower: np.ndarray, upper: np.ndarray, query_lower: np.ndarray, query_upper: np.ndarray) -> np.ndarray:
+        return np.all((lower <= query_upper + CONTACT_EPSILON) & (upper >= query_lower - CONTACT_EPSILON), axis=-1)
+
+    @staticmethod
+    def overlapping_pairs(lower: np.ndarray, upper: np.ndarray) -> np.ndarray:
+        """
+        (P, 2) index pairs i < j of overlapping boxes, by sort and sweep along x.
+        """
+        order = np.argsort(lower[:, 0], kind="stable")
+        sorted_lower_x = lower[order, 0]
+        # Boxes after i in sorted order that start before i ends are candidates.
+        ends = np.searchsorted(sorted_lower_x, upper[order, 0] + CONTACT_EPSILON, side="right")
+        counts = np.maximum(ends - np.arange(len(order)) - 1, 0)
+        first = np.repeat(np.arange(len(order)), counts)
+        offsets = np.arange(np.sum(counts)) - np.repeat(np.cumsum(counts) - counts, counts)
+        second = first + 1 + offsets
+        pairs = np.stack([order[first], order[second]], axis=1)
+        hits = AABB.overlap_hits(lower[pairs[:, 0]], upper[pairs[:, 0]], lower[pairs[:, 1]], upper[pairs[:, 1]])
+        return np.sort(pairs[hits], axis=1)
+
+    @staticmethod
+    def sweep_hits(lower: np.ndarray, upper: np.ndarray, query_lower: np.ndarray, query_upper: np.ndarray, direction: np.ndarray) -> np.ndarray:
+        """
+        Whether the query box, moving any non-negative distance along direction, can overlap each box.
+        """
+        # Minkowski sum: grow the boxes by the query half size, and cast a ray from the query center.
+        half_size = (query_upper - query_lower) / 2
+        center = (query_upper + query_lower) / 2
+        lower, upper = lower - half_size - CONTACT_EPSILON, upper + half_size + CONTACT_EPSILON
+        parallel = np.abs(direction) < CONTACT_EPSILON
+        safe_direction = np.where(parallel, 1, direction)
+        t1 = (lower - center) / safe_direction
+        t2 = (upper - center) / safe_direction
+        # Axes parallel to the ray either always or never contain it.
+        inside = (lower <= center) & (center <= upper)
+        t_enter = np.where(parallel, np.where(inside, -np.inf, np.inf), np.minimum(t1, t2))
+        t_exit = np.where(parallel, np.where(inside, np.inf, -np.inf), np.maximum(t1, t2))
+        return np.min(t_exit, axis=-1) >= np.maximum(np.max(t_enter, axis=-1), 0)
+
+    @staticmethod
+    def rotation_bounds(obbs: OBBArray, anchor: np.ndarray, axis: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        A box enclosing the boxes rotated by any angle about axis through anchor, i.e. the bounding cylinder around
+        axis of all their corners.
+        """
+        axis = axis / np.linalg.norm(axis)
+        offsets = obbs.corners().reshape(-1, 3) - anchor
+        axial = offsets @ axis
+        radius = np.max(np.linalg.norm(offsets - axial[:, np.newaxis] * axis, axis=1))
+        end_1, end_2 = anchor + np.min(axial) * axis, anchor + np.max(axial) * axis
+        # A disk of radius r with normal a extends r * sqrt(1 - a_i^2) along world axis i.
+        extents = radius * np.sqrt(np.clip(1 - axis * axis, 0, 1))
+        return np.minimum(end_1, end_2) - extents, np.maximum(end_1, end_2) + extents
+
+
 class SAT:
     def __init__(self):
         pass
@@ -48,61 +158,173 @@ class SAT:
                     continue
                 separation_axes.append(axis / axis_length)
         return separation_axes
-    
+
     @staticmethod
-    def slide_distance(obb1: OBB, obb2: OBB, axis1: np.ndarray) -> float | None:
+    def project(
+        positions1: np.ndarray, rotations1: np.ndarray, half_extents1: np.ndarray,
+        positions2: np.ndarray, rotations2: np.ndarray, half_extents2: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Projects box pairs onto their 15 candidate separation axes at once. The inputs are (..., 3), (..., 3, 3) and
+        (..., 3) arrays whose leading dimensions broadcast to the pair shape S.
+        Returns (axes, valid, sum_radius, initial_distance) of shapes (*S, 15, 3), (*S, 15), (*S, 15), (*S, 15),
+        where degenerate cross product axes (parallel box axes) are marked invalid.
+        """
+        shape = np.broadcast_shapes(positions1.shape[:-1], positions2.shape[:-1])
+        axes1, axes2 = np.swapaxes(rotations1, -1, -2), np.swapaxes(rotations2, -1, -2)
+        # Cross products of every axis pair, expanded by components, (*S, 3, 3, 3) -> (*S, 9, 3).
+        u = axes1[..., :, np.newaxis, :]
+        v = axes2[..., np.newaxis, :, :]
+        cross_axes = np.stack([
+            u[..., 1] * v[..., 2] - u[..., 2] * v[..., 1],
+            u[..., 2] * v[..., 0] - u[..., 0] * v[..., 2],
+            u[..., 0] * v[..., 1] - u[..., 1] * v[..., 0],
+        ], axis=-1).reshape(*shape, 9, 3)
+        cross_lengths = np.sqrt(np.sum(cross_axes * cross_axes, axis=-1))
+        cross_valid = cross_lengths >= CONTACT_EPSILON
+        cross_axes = cross_axes / np.where(cross_valid, cross_lengths, 1)[..., np.newaxis]
+        axes = np.concatenate([
+            np.broadcast_to(axes1, (*shape, 3, 3)),
+            np.broadcast_to(axes2, (*shape, 3, 3)),
+            cross_axes
+        ], axis=-2)
+        valid = np.concatenate([np.ones((*shape, 6), dtype=bool), cross_valid], axis=-1)
+        # Box radius along an axis is sum_k |axis . box_axis_k| * half_extent_k, where box_axis_k are rotation columns.
+        radius1 = (np.abs(axes @ rotations1) @ half_extents1[..., np.newaxis])[..., 0]
+        radius2 = (np.abs(axes @ rotations2) @ half_extents2[..., np.newaxis])[..., 0]
+        delta = positions2 - positions1
+        initial_distance = (axes @ delta[..., np.newaxis])[..., 0]
+        return axes, valid, radius1 + radius2, initial_distance
+
+    @staticmethod
+    def project_batch(obbs1: OBBArray, obbs2: OBBArray) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        # Every (obbs1[m], obbs2[n]) pair, S = (M, N).
+        return SAT.project(
+            obbs1.pose.positions[:, np.newaxis], obbs1.pose.rotations[:, np.newaxis], obbs1.half_extents[:, np.newaxis],
+            obbs2.pose.positions[np.newaxis], obbs2.pose.rotations[np.newaxis], obbs2.half_extents[np.newaxis]
+        )
+
+    @staticmethod
+    def project_pairs(obbs1: OBBArray, obbs2: OBBArray) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        # Element-wise (obbs1[p], obbs2[p]) pairs, S = (P,).
+        return SAT.project(
+            obbs1.pose.positions, obbs1.pose.rotations, obbs1.half_extents,
+            obbs2.pose.positions, obbs2.pose.rotations, obbs2.half_extents
+        )
+
+    @staticmethod
+    def slide_distance_batch(obbs1: OBBArray, obbs2: OBBArray, axis1: np.ndarray) -> np.ndarray:
+        """
+        Vectorized slide_distance() of every obbs1 box moving along axis1 against every obbs2 box.
+        Returns (M, N) distances, NaN where the pair never collides.
+        """
         axis1 = axis1 / np.linalg.norm(axis1)
-        # For each separation axis, compute the overlap interval.
-        d_first, d_last = -np.inf, np.inf
-        for separation_axis in SAT.generate_separation_axes(obb1, obb2):
-            # Compute initial properties: sum of radii, initial distance, and projected movement.
-            sum_radius = obb1.radius_along_axis(separation_axis) + obb2.radius_along_axis(separation_axis)
-            initial_distance = np.dot(obb2.pose.position - obb1.pose.position, separation_axis)
-            projected_movement = -np.dot(axis1, separation_axis)
-            # Determine overlapping interval.
-            if np.abs(projected_movement) < CONTACT_EPSILON:
-                if np.abs(initial_distance) > sum_radius - CONTACT_EPSILON: # to avoid tangential slide
-                    return None # Never will collide along this axis, can return early.
-                else:
-                    pass # No constraint on d_first/d_last along this axis.
-            else:
-                # math: |d0 + v * t| <= r
-                d1 = (-sum_radius - initial_distance) / projected_movement
-                d2 = (sum_radius - initial_distance) / projected_movement
-                d_enter, d_exit = min(d1, d2), max(d1, d2)
-                d_first, d_last = max(d_first, d_enter), min(d_last, d_exit)
-                if d_first > d_last + CONTACT_EPSILON:
-                    return None # No overlap interval, can return early.
-        return d_first
-    
+        axes, valid, sum_radius, initial_distance = SAT.project_batch(obbs1, obbs2)
+        projected_movement = -axes @ axis1
+        # Axes perpendicular to the movement either never collide, or put no constraint on the interval.
+        parallel = np.abs(projected_movement) < CONTACT_EPSILON
+        never_collide = np.any(valid & parallel & (np.abs(initial_distance) > sum_radius - CONTACT_EPSILON), axis=-1)
+        # math: |d0 + v * t| <= r
+        constrained = valid & ~parallel
+        safe_movement = np.where(constrained, projected_movement, 1)
+        d1 = (-sum_radius - initial_distance) / safe_movement
+        d2 = (sum_radius - initial_distance) / safe_movement
+        d_first = np.max(np.where(constrained, np.minimum(d1, d2), -np.inf), axis=-1)
+        d_last = np.min(np.where(constrained, np.maximum(d1, d2), np.inf), axis=-1)
+        collide = ~never_collide & (d_first <= d_last + CONTACT_EPSILON)
+        return np.where(collide, d_first, np.nan)
+
+    @staticmethod
+    def separation_distance_batch(obbs1: OBBArray, obbs2: OBBArray) -> np.ndarray:
+        """
+        Vectorized separation_distance() of every (obbs1[m], obbs2[n]) pair, returns (M, N) distances.
+        """
+        axes, valid, sum_radius, initial_distance = SAT.project_batch(obbs1, obbs2)
+        return np.max(np.where(valid, np.abs(initial_distance) - sum_radius, -np.inf), axis=-1)
+
+    @staticmethod
+    def separation_distance_pairs(obbs1: OBBArray, obbs2: OBBArray) -> np.ndarray:
+        """
+        Vectorized separation_distance() of element-wise (obbs1[p], obbs2[p]) pairs, returns (P,) distances.
+        """
+        axes, valid, sum_radius, initial_distance = SAT.project_pairs(obbs1, obbs2)
+        return np.max(np.where(valid, np.abs(initial_distance) - sum_radius, -np.inf), axis=-1)
+
+    @staticmethod
+    def slide_distance(obb1: OBB, obb2: OBB, axis1: np.ndarray) -> float | None:
+        distance = SAT.slide_distance_batch(obb1.as_array(), obb2.as_array(), axis1)[0, 0]
+        return None if np.isnan(distance) else float(distance)
+
     @staticmethod
     def separation_distance(obb1: OBB, obb2: OBB) -> float | None:
-        distance = -np.inf
-        for separation_axis in SAT.generate_separation_axes(obb1, obb2):
-            sum_radius = obb1.radius_along_axis(separation_axis) + obb2.radius_along_axis(separation_axis)
-            separation_distance = np.dot(obb2.pose.position - obb1.pose.position, separation_axis) - sum_radius
-            distance = max(distance, separation_distance)
-        return distance
+        return float(SAT.separation_distance_batch(obb1.as_array(), obb2.as_array())[0, 0])
     
     @staticmethod
-    def rotate_angle(obb1: OBB, obb2: OBB, anchor1: np.ndarray, axis1: np.ndarray, tolerance: float = 1.0E-4) -> float | None:
+    def rotated_separation_distance_batch(obbs1: OBBArray, obbs2: OBBArray, valid: np.ndarray, anchor1: np.ndarray, axis1: np.ndarray, angles: np.ndarray) -> np.ndarray:
+        """
+        For each angle, rotates all obbs1 boxes by it about axis1 through anchor1, and returns the minimum separation
+        distance over the valid (M, N) pairs. All K angles are evaluated in a single batch.
+        """
+        K, M = len(angles), len(obbs1)
+        rotations = rotation_matrix_from_axis_angle(axis1, angles)
+        # math: p' = a + R (p - a), R' = R @ R0
+        offsets = obbs1.pose.positions - anchor1
+        positions = anchor1 + offsets[np.newaxis] @ np.swapaxes(rotations, -1, -2)
+        orientations = rotations[:, np.newaxis] @ obbs1.pose.rotations[np.newaxis]
+        rotated_obbs1 = OBBArray(
+            PoseArray(positions.reshape(-1, 3), orientations.reshape(-1, 3, 3)),
+            np.tile(obbs1.half_extents, (K, 1))
+        )
+        distances = SAT.separation_distance_batch(rotated_obbs1, obbs2).reshape(K, M, -1)
+        return np.min(np.where(valid, distances, np.inf), axis=(1, 2))
+
+    @staticmethod
+    def rotate_angle_batch(obbs1: OBBArray, obbs2: OBBArray, anchor1: np.ndarray, axis1: np.ndarray, tolerance: float = 1.0E-4) -> float | None:
+        """
+        Smallest angle to rotate all obbs1 boxes about axis1 through anchor1 until any of them touches any obbs2 box.
+        Pairs that are already colliding are ignored, and None is returned if nothing is hit within a full turn.
+
+        The separation distance changes no faster than max_corner_radius per radian, so a sample with distance d
+        proves there is no contact within d / max_corner_radius of it. Each iteration evaluates a batch of samples
+        spread over a window ahead, and advances through them as long as these proven intervals connect. If nothing
+        is hit the window grows, otherwise it shrinks to end at the first sample that breaks the chain, bracketing
+        the contact ever tighter. Like plain conservative advancement the first contact is never skipped, and the
+        result stops short of it by less than tolerance, but each iteration shrinks the bracket by the sample count
+        instead of by the ratio of the contact speed to max_corner_radius.
+        """
         axis1 = axis1 / np.linalg.norm(axis1)
-        # Find max corner radius from obb1.
-        max_corner_radius = np.max(np.linalg.norm(np.cross(axis1, obb1.corners() - anchor1), axis=1))
-        # Conservative advancement loop.
-        accumulated_angle = 0.0
-        rotated_obb1 = obb1
-        while accumulated_angle < 2 * np.pi:
-            safe_distance = SAT.separation_distance(rotated_obb1, obb2)
-            if safe_distance < 0:
-                return None if accumulated_angle == 0 else accumulated_angle
-            else:
-                safe_angle = safe_distance / max_corner_radius
-                accumulated_angle += safe_angle
-                rotated_obb1 = obb1.rotate(anchor1, axis1, accumulated_angle)
-                if safe_distance < tolerance:
-                    return accumulated_angle
-        return None
+        max_corner_radius = np.max(np.linalg.norm(np.cross(axis1, obbs1.corners().reshape(-1, 3) - anchor1), axis=1))
+        separation = SAT.separation_distance_batch(obbs1, obbs2)
+        valid = separation >= 0
+        if not np.any(valid):
+            return None
+        angle, distance = 0.0, np.min(separation[valid])
+        window = ROTATE_SAMPLES * distance / max_corner_radius
+        for _ in range(ROTATE_MAX_ITERATIONS):
+            if distance < tolerance:
+                return angle + distance / max_corner_radius
+            if angle >= 2 * np.pi:
+                return None
+            if window < CONTACT_EPSILON:
+                # Collides right after a proven safe angle, only possible through numerical error.
+                return angle
+            sample_angles = angle + window * np.arange(1, ROTATE_SAMPLES + 1) / ROTATE_SAMPLES
+            sample_distances = SAT.rotated_separation_distance_batch(obbs1, obbs2, valid, anchor1, axis1, sample_angles)
+            # Advance while the proven contact-free intervals of the samples connect.
+            reach = angle + distance / max_corner_radius
+            window_end = None
+            for sample_angle, sample_distance in zip(sample_angles, sample_distances):
+                if sample_distance < 0 or sample_angle - sample_distance / max_corner_radius > reach:
+                    window_end = sample_angle
+                    break
+                angle, distance = sample_angle, sample_distance
+                reach = max(reach, angle + distance / max_corner_radius)
+            window = 2 * window if window_end is None else window_end - angle
+        return angle + distance / max_corner_radius
+
+    @staticmethod
+    def rotate_angle(obb1: OBB, obb2: OBB, anchor1: np.ndarray, axis1: np.ndarray, tolerance: float = 1.0E-4) -> float | None:
+        return SAT.rotate_angle_batch(obb1.as_array(), obb2.as_array(), anchor1, axis1, tolerance)
 
 if __name__ == "__main__":
     obb1 = OBB(Pose(np.array([0, 0, 0]), np.eye(3)), np.array([1, 1, 1]))
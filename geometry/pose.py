@@ -1,19 +1,48 @@
 import numpy as np
 
-def rotation_matrix_from_axis_angle(axis: np.ndarray, angle: float) -> np.ndarray:
-    axis = axis / np.linalg.norm(axis)
-    skew_axis = np.array([[0, -axis[2], axis[1]], [axis[2], 0, -axis[0]], [-axis[1], axis[0], 0]])
-    R = np.eye(3) + np.sin(angle) * skew_axis + (1 - np.cos(angle)) * (skew_axis @ skew_axis)
+def rotation_matrix_from_axis_angle(axis: np.ndarray, angle: float | np.ndarray) -> np.ndarray:
+    # NOTE Also accepts batched input: axis (..., 3) and angle (...) broadcast to (..., 3, 3).
+    axis = np.asarray(axis, dtype=float)
+    angle = np.asarray(angle, dtype=float)
+    if axis.ndim == 1 and angle.ndim == 0:
+        axis = axis / np.linalg.norm(axis)
+        skew_axis = np.array([[0, -axis[2], axis[1]], [axis[2], 0, -axis[0]], [-axis[1], axis[0], 0]])
+        R = np.eye(3) + np.sin(angle) * skew_axis + (1 - np.cos(angle)) * (skew_axis @ skew_axis)
+        return R
+    axis = axis / np.linalg.norm(axis, axis=-1, keepdims=True)
+    axis, angle = np.broadcast_arrays(axis, angle[..., np.newaxis])
+    angle = angle[..., 0]
+    zero = np.zeros(angle.shape)
+    skew_axis = np.stack([
+        np.stack([zero, -axis[..., 2], axis[..., 1]], axis=-1),
+        np.stack([axis[..., 2], zero, -axis[..., 0]], axis=-1),
+        np.stack([-axis[..., 1], axis[..., 0], zero], axis=-1),
+    ], axis=-2)
+    sin = np.sin(angle)[..., np.newaxis, np.newaxis]
+    cos = np.cos(angle)[..., np.newaxis, np.newaxis]
+    R = np.eye(3) + sin * skew_axis + (1 - cos) * (skew_axis @ skew_axis)
     return R
 
-def rotation_matrix_from_rpy(roll: float, pitch: float, yaw: float) -> np.ndarray:
-    R_x = np.array([[1, 0, 0], [0, np.cos(roll), -np.sin(roll)], [0, np.sin(roll), np.cos(roll)]])
-    R_y = np.array([[np.cos(pitch), 0, np.sin(pitch)], [0, 1, 0], [-np.sin(pitch), 0, np.cos(pitch)]])
-    R_z = np.array([[np.cos(yaw), -np.sin(yaw), 0], [np.sin(yaw), np.cos(yaw), 0], [0, 0, 1]])
+def rotation_matrix_from_rpy(roll: float | np.ndarray, pitch: float | np.ndarray, yaw: float | np.ndarray) -> np.ndarray:
+    # NOTE Also accepts batched input: roll, pitch and yaw (...) broadcast to (..., 3, 3).
+    if np.ndim(roll) == 0 and np.ndim(pitch) == 0 and np.ndim(yaw) == 0:
+        R_x = np.array([[1, 0, 0], [0, np.cos(roll), -np.sin(roll)], [0, np.sin(roll), np.cos(roll)]])
+        R_y = np.array([[np.cos(pitch), 0, np.sin(pitch)], [0, 1, 0], [-np.sin(pitch), 0, np.cos(pitch)]])
+        R_z = np.array([[np.cos(yaw), -np.sin(yaw), 0], [np.sin(yaw), np.cos(yaw), 0], [0, 0, 1]])
+        return R_x @ R_y @ R_z
+    roll, pitch, yaw = np.broadcast_arrays(*(np.asarray(angle, dtype=float) for angle in (roll, pitch, yaw)))
+    zero, one = np.zeros(roll.shape), np.ones(roll.shape)
+    def stack_matrix(rows: list[list[np.ndarray]]) -> np.ndarray:
+        return np.stack([np.stack(row, axis=-1) for row in rows], axis=-2)
+    R_x = stack_matrix([[one, zero, zero], [zero, np.cos(roll), -np.sin(roll)], [zero, np.sin(roll), np.cos(roll)]])
+    R_y = stack_matrix([[np.cos(pitch), zero, np.sin(pitch)], [zero, one, zero], [-np.sin(pitch), zero, np.cos(pitch)]])
+    R_z = stack_matrix([[np.cos(yaw), -np.sin(yaw), zero], [np.sin(yaw), np.cos(yaw), zero], [zero, zero, one]])
     return R_x @ R_y @ R_z
 
 
 class Pose:
+    __slots__ = ("position", "rotation")
+
     def __init__(
             self,
             position: np.ndarray = np.array([0, 0, 0]),
@@ -23,21 +52,98 @@ class Pose:
         # NOTE Here the rotation also encodes reflection.
         self.position = np.array(position)
         self.rotation = np.array(rotation)
-    
+
     def set_position(self, position: np.ndarray):
         self.position = position
-    
+
     def set_rotation(self, rotation: np.ndarray):
         self.rotation = rotation
-    
-    def __mul__(self, other: "Pose"):
+
+    def __mul__(self, other: "Pose | PoseArray"):
+        if isinstance(other, PoseArray):
+            return PoseArray(self.position + other.positions @ self.rotation.T, self.rotation @ other.rotations)
         return Pose(self.position + self.rotation @ other.position, self.rotation @ other.rotation)
-    
+
     def apply_point(self, point: np.ndarray) -> np.ndarray:
+        # NOTE point can also be (..., 3), e.g. all corners of a box at once.
+        if np.ndim(point) > 1:
+            return self.position + point @ self.rotation.T
         return self.position + self.rotation @ point
-    
+
     def apply_vector(self, vector: np.ndarray) -> np.ndarray:
+        if np.ndim(vector) > 1:
+            return vector @ self.rotation.T
         return self.rotation @ vector
 
     def inverse(self) -> "Pose":
         return Pose(self.rotation.T @ -self.position, self.rotation.T)
+
+
+class PoseArray:
+    """
+    N poses stored as (N, 3) positions and (N, 3, 3) rotations, so that rigid transform math over many bodies is done
+    in single NumPy calls instead of one `Pose` per body. Like `Pose`, the rotations may also encode reflection.
+    """
+    __slots__ = ("positions", "rotations")
+
+    def __init__(self, positions: np.ndarray, rotations: np.ndarray):
+        self.positions = np.asarray(positions, dtype=float).reshape(-1, 3)
+        self.rotations = np.asarray(rotations, dtype=float).reshape(-1, 3, 3)
+        if len(self.positions) != len(self.rotations):
+            raise ValueError(f"got {len(self.positions)} positions but {len(self.rotations)} rotations")
+
+    @staticmethod
+    def identity(count: int) -> "PoseArray":
+        return PoseArray(np.zeros((count, 3)), np.broadcast_to(np.eye(3), (count, 3, 3)))
+
+    @staticmethod
+    def stack(poses: "list[Pose]") -> "PoseArray":
+        if len(poses) == 0:
+            return PoseArray.identity(0)
+        return PoseArray(
+            np.stack([pose.position for pose in poses]),
+            np.stack([pose.rotation for pose in poses])
+        )
+
+    @staticmethod
+    def concatenate(pose_arrays: "list[PoseArray]") -> "PoseArray":
+        if len(pose_arrays) == 0:
+            return PoseArray.identity(0)
+        return PoseArray(
+            np.concatenate([pose_array.positions for pose_array in pose_arrays]),
+            np.concatenate([pose_array.rotations for pose_array in pose_arrays])
+        )
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def __getitem__(self, index: int | slice | np.ndarray) -> "Pose | PoseArray":
+        if isinstance(index, (int, np.integer)):
+            return Pose(self.positions[index], self.rotations[index])
+        return PoseArray(self.positions[index], self.rotations[index])
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def __mul__(self, other: "Pose | PoseArray") -> "PoseArray":
+        # Element-wise compose, where a single Pose is broadcast against every element.
+        if isinstance(other, Pose):
+            return PoseArray(self.positions + self.rotations @ other.position, self.rotations @ other.rotation)
+        return PoseArray(
+            self.positions + np.einsum("nij,nj->ni", self.rotations, other.positions),
+            self.rotations @ other.rotations
+        )
+
+    def apply_point(self, point: np.ndarray) -> np.ndarray:
+        # point is either one (3,) point for all poses, or (N, 3) points for each pose.
+        return self.positions + self.apply_vector(point)
+
+    def apply_vector(self, vector: np.ndarray) -> np.ndarray:
+        if np.ndim(vector) == 1:
+            return self.rotations @ vector
+        return np.einsum("nij,nj->ni", self.rotations, vector)
+
+    def inverse(self) -> "PoseArray":
+        rotations_inverse = np.swapaxes(self.rotations, -1, -2)
+        return PoseArray(-np.einsum("nij,nj->ni", rotations_inverse, self.positions), rotations_inverse)
@@ -1,4 +1,6 @@
+import os
 import time
+import threading
 import logging
 logging.basicConfig(level=logging.INFO)
 
@@ -7,111 +9,34 @@ import mujoco
 import mujoco.viewer
 
 from Domino.components import *
-from Domino.geometry.pose import Pose
+from Domino.compiler import CompiledScene, ModelCache, PhysicsOptions, assign_materials, build_spec
+from Domino.simulation import StateBuffer
 from Domino.scenes.test_scenes import *
 from Domino.scenes.demo_scenes import *
 
-PALETTE = [
-    "0.96 0.96 0.96", # White
-    "0.92 0.39 0.12", # Orange
-    "0.86 0.16 0.16", # Red
-    # "0.55 0.24 0.71", # Purple
-    # "0.90 0.35 0.55", # Pink
-    # "0.39 0.20 0.16", # Brown
-    "0.12 0.12 0.12", # Black
-    "0.94 0.82 0.08", # Yellow
-    "0.12 0.63 0.24", # Green
-    "0.20 0.71 0.86", # Light Blue / Cyan
-    "0.08 0.31 0.71"  # Dark Blue
-]
-MATERIALS = [
-f"""<material name="domino_mat_{i}"
-    rgba="{color} 1"
-    specular="0.35"
-    shininess="0.2"
-    reflectance="0.1"
-/>""" for i, color in enumerate(PALETTE)
-]
+# Solved gate layouts persist here across runs, see enable_layout_cache.
+LAYOUT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "layouts")
+# Compiled models persist here across runs, see ModelCache.
+MODEL_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "models")
 
 SEED = 42
 np.random.seed(SEED)
 SLOW_DOWN_FACTOR = 5
 TIME_STEP = 0.005
 WARM_UP_TIME = 0.0
+# The viewer shows DISPLAY_FPS frames per second, each after as many substeps as keep physics at 1 / SLOW_DOWN_FACTOR
+# of real time. Stepping stops for a frame after MAX_STEPPING_TIME, and with PHYSICS_THREAD it runs on its own thread.
+DISPLAY_FPS = 60
+MAX_STEPPING_TIME = 0.25
+PHYSICS_THREAD = False
+# Backspace in the viewer rewinds this many seconds, as far back as the state buffer reaches.
+REWIND_TIME = 1.0
+GLFW_KEY_BACKSPACE = 259
 
-def CompileComponent(component: Component, to_world: Pose, xml_body_specs: list[str] = []) -> None:
-    if type(component) == Domino:
-        body_id = len(xml_body_specs)
-        position_vector = to_world.position
-        pos = f"{position_vector[0]} {position_vector[1]} {position_vector[2]}"
-        rotation_matrix = to_world.rotation
-        xyaxes = f"{rotation_matrix[0, 0]} {rotation_matrix[1, 0]} {rotation_matrix[2, 0]} {rotation_matrix[0, 1]} {rotation_matrix[1, 1]} {rotation_matrix[2, 1]}"
-        xml_body_spec = f"""
-        <body name="body_{body_id}" pos="{pos}" xyaxes="{xyaxes}">
-            <freejoint/>
-            <geom
-                name="collision_{body_id}"
-                type="box"
-                size="{Domino.SIZE[0] / 2} {Domino.SIZE[1] / 2} {Domino.SIZE[2] / 2}"
-                density="1000"
-                friction="0.2 0.005 0.0001"
-                group="1"
-            />
-            <geom
-                name="visual_{body_id}"
-                type="mesh"
-                mesh="domino_bevel_mesh"
-                material="domino_mat_{np.random.randint(len(PALETTE))}"
-                contype="0"
-                conaffinity="0"
-                group="0"
-            />
-        </body>"""
-        xml_body_specs.append(xml_body_spec)
-        return
-    for child_name, child in component.children.items():
-        child_to_world = to_world * child.to_parent
-        CompileComponent(child, child_to_world, xml_body_specs)
-
-def CompileWorld(scene: Component) -> str:
-    xml_body_specs = []
-    CompileComponent(scene, scene.to_parent, xml_body_specs)
-    ground_obb = Ground().obb_in_world()
-    xml = f"""
-<mujoco model="world">
-  <option
-    timestep="{TIME_STEP}"
-    gravity="0 0 -9.81"
-    integrator="implicit"
-    cone="elliptic"
-    solver="Newton"
-    iterations="100"
-    noslip_iterations="5"
-    noslip_tolerance="0.00001"
-  />
-  <default>
-    <geom solref="0.025 1" solimp="0.99 0.99 0.002" friction="1 0.005 0.0001"/>
-  </default>
-  <visual>
-    <global offwidth="1280" offheight="720"/>
-    <headlight ambient="0.5 0.5 0.5" diffuse="0.8 0.8 0.8" specular="0.15 0.15 0.15"/>
-  </visual>
-  <asset>
-    <mesh name="domino_bevel_mesh" file="Domino/assets/domino_bevel.obj"/>
-    <texture name="grid" type="2d" builtin="checker" width="512" height="512"
-             rgb1="0.2 0.3 0.4" rgb2="0.1 0.15 0.2"/>
-    <material name="grid" texture="grid" texrepeat="6 6" texuniform="true" reflectance="0.05"/>
-    {"\n".join(MATERIALS)}
-  </asset>
-  <worldbody>
-    <light pos="-2 -2 5"/>
-    <geom name="ground" type="plane" pos="0 0 0" size="{ground_obb.half_extents[0]} {ground_obb.half_extents[1]} 0.1" material="grid"
-          friction="1.0 0.01 0.001" priority="1" />
-{"\n".join(xml_body_specs)}
-  </worldbody>
-</mujoco>
-"""
-    return xml
+def CompileWorld(scene: Component | CompiledScene) -> str:
+    # NOTE Only an export of the model that main() builds directly through MjSpec.
+    compiled_scene = scene if isinstance(scene, CompiledScene) else CompiledScene.from_component(scene)
+    return build_spec(compiled_scene, assign_materials(compiled_scene), PhysicsOptions(timestep=TIME_STEP)).to_xml()
 
 def configure_camera(camera: mujoco.MjvCamera) -> None:
     camera.azimuth = 90
@@ -121,28 +46,91 @@ def configure_camera(camera: mujoco.MjvCamera) -> None:
     camera.lookat[:] = [0, 0, 0]
 
 
+class RealTimeStepper:
+    """
+    Advances physics to where the wall clock says it should be, 1 / SLOW_DOWN_FACTOR simulated seconds per second
+    after WARM_UP_TIME. Each call runs however many substeps that takes, so when rendering is slow the display skips
+    frames and the simulation keeps its pace. Rewind requests from the viewer are applied here too.
+    """
+    def __init__(self, model: mujoco.MjModel, data: mujoco.MjData, state_buffer: StateBuffer):
+        self.model = model
+        self.data = data
+        self.state_buffer = state_buffer
+        self.rewind_requests = []
+        self.wall_start_time = time.perf_counter()
+        self.sim_start_time = data.time
+
+    def target_time(self, wall_time: float) -> float:
+        return self.sim_start_time + max(wall_time - self.wall_start_time - WARM_UP_TIME, 0.0) / SLOW_DOWN_FACTOR
+
+    def lag(self) -> float:
+        # Simulated seconds physics is behind the wall clock.
+        return max(self.target_time(time.perf_counter()) - self.data.time, 0.0)
+
+    def advance(self, deadline: float) -> None:
+        # Steps up to the target time, but returns at the deadline so that the display still updates.
+        while len(self.rewind_requests) > 0:
+            rewind_time = max(self.data.time - self.rewind_requests.pop(), 0.0)
+            if self.state_buffer.state_at(rewind_time) is not None:
+                self.state_buffer.restore(self.data, rewind_time)
+                # NOTE Restart the clock, rather than fast-forwarding back to where the wall clock is.
+                self.wall_start_time, self.sim_start_time = time.perf_counter() - WARM_UP_TIME, self.data.time
+        target_time = self.target_time(time.perf_counter())
+        while self.data.time < target_time and time.perf_counter() < deadline:
+            self.state_buffer.record(self.data)
+            mujoco.mj_step(self.model, self.data)
+
+
 def main() -> None:
+    enable_layout_cache(LAYOUT_CACHE_DIR)
     # scene = test_scene_u_turn()
     scene = scene_half_adder()
-    xml = CompileWorld(scene)
-    model = mujoco.MjModel.from_xml_string(xml)
+    compiled_scene = CompiledScene.from_component(scene)
+    material_ids = assign_materials(compiled_scene)
+    model = ModelCache(MODEL_CACHE_DIR).build_model(compiled_scene, material_ids, PhysicsOptions(timestep=TIME_STEP))
     data = mujoco.MjData(model)
-    with mujoco.viewer.launch_passive(model, data, show_left_ui=False, show_right_ui=False) as viewer:
+    stepper = RealTimeStepper(model, data, StateBuffer(model, capacity=1200, sample_interval=0.05))
+    def key_callback(key: int) -> None:
+        # NOTE Called on the viewer thread, the rewind itself happens in RealTimeStepper.advance().
+        if key == GLFW_KEY_BACKSPACE:
+            stepper.rewind_requests.append(REWIND_TIME)
+    frame_interval = 1.0 / DISPLAY_FPS
+    dropped_frames = 0
+    with mujoco.viewer.launch_passive(model, data, show_left_ui=False, show_right_ui=False, key_callback=key_callback) as viewer:
         viewer.opt.geomgroup[1] = 0
         configure_camera(viewer.cam)
-        sim_start_time = time.time()
+        lock = threading.Lock()
+        running = threading.Event()
+        running.set()
+        def physics_loop() -> None:
+            while running.is_set():
+                # Holds the lock for at most one frame, so that sync() never waits long or copies a half step.
+                with lock:
+                    stepper.advance(time.perf_counter() + frame_interval)
+                if stepper.lag() < model.opt.timestep:
+                    time.sleep(model.opt.timestep * SLOW_DOWN_FACTOR)
+        stepper.wall_start_time = next_frame_time = time.perf_counter()
+        physics_thread = threading.Thread(target=physics_loop, daemon=True) if PHYSICS_THREAD else None
+        if physics_thread is not None:
+            physics_thread.start()
         while viewer.is_running():
             # viewer.cam.azimuth += 360 / 5 * TIME_STEP
-            frame_start_time = time.time()
-            if frame_start_time - sim_start_time > WARM_UP_TIME:
-                mujoco.mj_step(model, data)
-            viewer.sync()
-            frame_end_time = time.time()
-            dt = frame_end_time - frame_start_time
-            if dt < model.opt.timestep * SLOW_DOWN_FACTOR:
-                time.sleep(model.opt.timestep * SLOW_DOWN_FACTOR - dt)
+            if physics_thread is None:
+                stepper.advance(time.perf_counter() + MAX_STEPPING_TIME)
+            with lock:
+                viewer.sync()
+            next_frame_time += frame_interval
+            now = time.perf_counter()
+            if now < next_frame_time:
+                time.sleep(next_frame_time - now)
             else:
-                print(f"Delay detected: {dt - model.opt.timestep}")
+                # Behind schedule, skip the frames that are already late instead of slowing physics down.
+                dropped_frames += int((now - next_frame_time) / frame_interval)
+                next_frame_time = now
+        running.clear()
+        if physics_thread is not None:
+            physics_thread.join()
+    print(f"Dropped {dropped_frames} display frames, physics ended {stepper.lag():.3f} s behind")
     # mujoco.viewer.launch(model, data, show_left_ui=False, show_right_ui=False)
 
 if __name__ == "__main__":
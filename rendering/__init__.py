@@ -0,0 +1,8 @@
+from .offline import OfflineRenderer
+from .replay import CameraPath, ReplayRenderer
+
+__all__ = [
+    "CameraPath",
+    "OfflineRenderer",
+    "ReplayRenderer",
+]
@@ -0,0 +1,130 @@
+import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+from Domino.rendering.replay import CameraPath, ReplayRenderer
+from Domino.simulation.trajectory import TrajectoryReader
+
+# Per worker process, the replay renderer made by _initialize_worker.
+_replay = None
+
+
+def _initialize_worker(trajectory_path: str, width: int, height: int, camera_path: CameraPath | None) -> None:
+    global _replay
+    _replay = ReplayRenderer(TrajectoryReader(trajectory_path), width=width, height=height, camera_path=camera_path)
+
+
+def _save_png(pixels: np.ndarray, path: Path) -> None:
+    Image.fromarray(pixels).save(path)
+
+
+def _render_png_range(first_index: int, times: np.ndarray, output_dir: Path, writer_threads: int) -> int:
+    # Renders into a small ring of reused buffers, a buffer being free again once its previous frame is written.
+    shape = (_replay.renderer.height, _replay.renderer.width, 3)
+    buffers = [np.empty(shape, dtype=np.uint8) for _ in range(writer_threads + 1)]
+    pending = [None] * len(buffers)
+    with ThreadPoolExecutor(max_workers=writer_threads) as writers:
+        for offset, time in enumerate(times):
+            slot = offset % len(buffers)
+            if pending[slot] is not None:
+                pending[slot].result()
+            _replay.render_frame(time, out=buffers[slot])
+            pending[slot] = writers.submit(_save_png, buffers[slot], output_dir / f"{first_index + offset}.png")
+        for future in pending:
+            if future is not None:
+                future.result()
+    return len(times)
+
+
+def _render_raw_range(first_index: int, times: np.ndarray, raw_path: Path, frame_count: int) -> int:
+    # Renders straight into the frames of the shared raw file, no copy and no encoding.
+    shape = (frame_count, _replay.renderer.height, _replay.renderer.width, 3)
+    frames = np.memmap(raw_path, dtype=np.uint8, mode="r+", shape=shape)
+    for offset, time in enumerate(times):
+        _replay.render_frame(time, out=frames[first_index + offset])
+    frames.flush()
+    return len(times)
+
+
+class OfflineRenderer:
+    """
+    Renders a recorded trajectory on several worker processes, each with its own offscreen `ReplayRenderer`, over
+    contiguous ranges of frames. Frames go either to numbered PNGs, encoded on a pool of writer threads per worker so
+    that compression overlaps rendering, or to one raw rgb24 file that an encoder reads directly, e.g.
+    ffmpeg -f rawvideo -pix_fmt rgb24 -s <width>x<height> -r <fps> -i frames.rgb out.mp4
+    """
+    RANGES_PER_WORKER = 4
+
+    def __init__(self, trajectory_path: str | Path, width: int = 1280, height: int = 720, camera_path: CameraPath | None = None, fps: float = 60, start_time: float | None = None, end_time: float | None = None, workers: int | None = None):
+        self.trajectory_path = Path(trajectory_path)
+        self.width = width
+        self.height = height
+        self.camera_path = camera_path
+        self.workers = workers if workers is not None else os.cpu_count()
+        trajectory = TrajectoryReader(trajectory_path)
+        start_time = trajectory.times[0] if start_time is None else start_time
+        end_time = trajectory.times[-1] if end_time is None else end_time
+        self.frame_times = start_time + np.arange(int(np.floor((end_time - start_time) * fps + 1.0E-6)) + 1) / fps
+
+    def frame_ranges(self) -> list[tuple[int, np.ndarray]]:
+        # (first index, times) of contiguous ranges, a few per worker so that slow ranges even out.
+        range_count = min(len(self.frame_times), self.workers * OfflineRenderer.RANGES_PER_WORKER)
+        bounds = np.linspace(0, len(self.frame_times), range_count + 1).astype(int)
+        return [(int(start), self.frame_times[start:end]) for start, end in zip(bounds[:-1], bounds[1:]) if end > start]
+
+    def _run(self, function, *args) -> int:
+        # NOTE Workers are spawned rather than forked, GL contexts do not survive a fork. They need an offscreen GL
+        # backend, EGL unless MUJOCO_GL is already set (e.g. to osmesa). mujoco reads MUJOCO_GL on import, before any
+        # initializer runs, so it has to be in the environment a worker copies when it starts. Workers start on the
+        # submits, and MUJOCO_GL is only set for their duration.
+        default_gl = "MUJOCO_GL" not in os.environ
+        with ProcessPoolExecutor(
+            max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"),
+            initializer=_initialize_worker, initargs=(str(self.trajectory_path), self.width, self.height, self.camera_path)
+        ) as executor:
+            if default_gl:
+                os.environ["MUJOCO_GL"] = "egl"
+            try:
+                futures = [executor.submit(function, first_index, times, *args) for first_index, times in self.frame_ranges()]
+            finally:
+                if default_gl:
+                    del os.environ["MUJOCO_GL"]
+            return sum(future.result() for future in futures)
+
+    def render_png(self, output_dir: str | Path, writer_threads: int = 2) -> int:
+        # Writes <output_dir>/<index>.png and returns the frame count.
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        return self._run(_render_png_range, output_dir, writer_threads)
+
+    def render_raw(self, raw_path: str | Path) -> int:
+        # Writes all frames as consecutive (height, width, 3) uint8 images to raw_path and returns the frame count.
+        raw_path = Path(raw_path)
+        raw_path.parent.mkdir(parents=True, exist_ok=True)
+        frames = np.memmap(raw_path, dtype=np.uint8, mode="w+", shape=(len(self.frame_times), self.height, self.width, 3))
+        del frames
+        return self._run(_render_raw_range, raw_path, len(self.frame_times))
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+    import mujoco
+    # Usage: python -m Domino.rendering.offline trajectory_dir output_dir|output.rgb [fps] [workers]
+    camera = mujoco.MjvCamera()
+    camera.azimuth, camera.elevation, camera.distance = 90, -60, 2.5
+    offline = OfflineRenderer(
+        sys.argv[1], camera_path=CameraPath.fixed(camera),
+        fps=float(sys.argv[3]) if len(sys.argv) > 3 else 60,
+        workers=int(sys.argv[4]) if len(sys.argv) > 4 else None,
+    )
+    start_time = time.perf_counter()
+    if sys.argv[2].endswith(".rgb"):
+        frame_count = offline.render_raw(sys.argv[2])
+    else:
+        frame_count = offline.render_png(sys.argv[2])
+    print(f"rendered {frame_count} frames in {time.perf_counter() - start_time:.1f} s")
@@ -0,0 +1,112 @@
+from pathlib import Path
+
+import numpy as np
+import mujoco
+from PIL import Image
+
+from Domino.simulation.trajectory import TrajectoryReader
+
+
+class CameraPath:
+    """
+    Free camera keyframes (time, azimuth, elevation, distance, lookat), linearly interpolated in between and held
+    outside. Angles are in degrees like `MjvCamera`.
+    """
+    def __init__(self, times: np.ndarray, azimuths: np.ndarray, elevations: np.ndarray, distances: np.ndarray, lookats: np.ndarray):
+        self.times = np.asarray(times, dtype=float)
+        self.azimuths = np.asarray(azimuths, dtype=float)
+        self.elevations = np.asarray(elevations, dtype=float)
+        self.distances = np.asarray(distances, dtype=float)
+        self.lookats = np.asarray(lookats, dtype=float).reshape(-1, 3)
+        if np.any(np.diff(self.times) <= 0):
+            raise ValueError("camera keyframe times must be increasing")
+
+    @staticmethod
+    def fixed(camera: mujoco.MjvCamera) -> "CameraPath":
+        return CameraPath([0.0], [camera.azimuth], [camera.elevation], [camera.distance], [camera.lookat.copy()])
+
+    @staticmethod
+    def orbit(lookat: np.ndarray, distance: float, elevation: float, start_azimuth: float, degrees_per_second: float, duration: float) -> "CameraPath":
+        return CameraPath(
+            [0.0, duration], [start_azimuth, start_azimuth + degrees_per_second * duration],
+            [elevation, elevation], [distance, distance], [lookat, lookat]
+        )
+
+    def apply(self, camera: mujoco.MjvCamera, time: float) -> None:
+        camera.type = mujoco.mjtCamera.mjCAMERA_FREE
+        camera.azimuth = np.interp(time, self.times, self.azimuths)
+        camera.elevation = np.interp(time, self.times, self.elevations)
+        camera.distance = np.interp(time, self.times, self.distances)
+        camera.lookat[:] = [np.interp(time, self.times, self.lookats[:, axis]) for axis in range(3)]
+
+
+class ReplayRenderer:
+    """
+    Renders a recorded trajectory without simulating it again. For each frame the qpos is interpolated between the two
+    nearest recorded frames (positions linearly, free joint quaternions normalized after), then only mj_kinematics
+    and mj_camlight run before rendering, so a new camera path costs only the rendering time.
+    """
+    def __init__(self, trajectory: TrajectoryReader, model: mujoco.MjModel | None = None, width: int = 1280, height: int = 720, camera_path: CameraPath | None = None):
+        self.trajectory = trajectory
+        self.model = model if model is not None else trajectory.load_model()
+        self.data = mujoco.MjData(self.model)
+        self.renderer = mujoco.Renderer(self.model, height=height, width=width)
+        self.camera = mujoco.MjvCamera()
+        self.camera_path = camera_path
+        # Like the viewer in main.py, hide the collision boxes behind the visual meshes.
+        self.scene_option = mujoco.MjvOption()
+        self.scene_option.geomgroup[1] = 0
+        free_joints = np.flatnonzero(self.model.jnt_type == mujoco.mjtJoint.mjJNT_FREE)
+        self.quaternion_addresses = self.model.jnt_qposadr[free_joints][:, np.newaxis] + np.arange(3, 7)
+
+    def frame_times(self, fps: float, start_time: float | None = None, end_time: float | None = None) -> np.ndarray:
+        times = self.trajectory.times
+        start_time = times[0] if start_time is None else start_time
+        end_time = times[-1] if end_time is None else end_time
+        return start_time + np.arange(int(np.floor((end_time - start_time) * fps + 1.0E-6)) + 1) / fps
+
+    def qpos_at(self, time: float) -> np.ndarray:
+        # NOTE Frames may be unevenly spaced, when the writer was called less often than its sample interval.
+        times = self.trajectory.times
+        index = int(np.clip(np.searchsorted(times, time, side="right") - 1, 0, max(len(times) - 2, 0)))
+        weight = float(np.clip((time - times[index]) / (times[index + 1] - times[index]), 0, 1)) if len(times) > 1 else 0.0
+        qpos = self.trajectory.frame(index)
+        if weight > 0:
+            qpos += weight * (self.trajectory.frame(index + 1) - qpos)
+            quaternions = qpos[self.quaternion_addresses]
+            qpos[self.quaternion_addresses] = quaternions / np.linalg.norm(quaternions, axis=1, keepdims=True)
+        return qpos
+
+    def render_frame(self, time: float, out: np.ndarray | None = None) -> np.ndarray:
+        # (height, width, 3) uint8 pixels at time, written into out if given.
+        self.data.qpos[:] = self.qpos_at(time)
+        mujoco.mj_kinematics(self.model, self.data)
+        mujoco.mj_camlight(self.model, self.data)
+        if self.camera_path is not None:
+            self.camera_path.apply(self.camera, time)
+        self.renderer.update_scene(self.data, self.camera, self.scene_option)
+        return self.renderer.render(out=out)
+
+    def render(self, output_dir: str | Path, fps: float = 60, start_time: float | None = None, end_time: float | None = None) -> int:
+        # Writes frames as <output_dir>/<index>.png like _demo.py, and returns the frame count.
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        frame_times = self.frame_times(fps, start_time, end_time)
+        for index, time in enumerate(frame_times):
+            Image.fromarray(self.render_frame(time)).save(output_dir / f"{index}.png")
+        return len(frame_times)
+
+    def close(self) -> None:
+        self.renderer.close()
+
+
+if __name__ == "__main__":
+    import sys
+    # Usage: python -m Domino.rendering.replay trajectory_dir output_dir [fps]
+    trajectory = TrajectoryReader(sys.argv[1])
+    camera = mujoco.MjvCamera()
+    camera.azimuth, camera.elevation, camera.distance = 90, -60, 2.5
+    replay = ReplayRenderer(trajectory, camera_path=CameraPath.fixed(camera))
+    frame_count = replay.render(sys.argv[2], float(sys.argv[3]) if len(sys.argv) > 3 else 60)
+    replay.close()
+    print(f"rendered {frame_count} frames")
@@ -34,15 +34,15 @@ def scene_or_gate_run() -> Component:
         OrGate()
     ))
     scene.add_child("start_1", (
-        Domino().standing()
+        Domino.standing()
         .place("z-", scene.anchor(np.array([-1, 0.2, 0])))
     ))
     scene.add_child("start_2", (
-        Domino().standing()
+        Domino.standing()
         .place("z-", scene.anchor(np.array([-1, -0.2, 0])))
     ))
     scene.add_child("end", (
-        Domino().standing()
+        Domino.standing()
         .place("z-", scene.anchor(np.array([1, 0, 0])))
     ))
     scene.connect("start_1", "out", "gate", "in_1")
@@ -63,15 +63,15 @@ def scene_and_gate_run() -> Component:
         LeanAndGate()
     ))
     scene.add_child("start_1", (
-        Domino().standing()
+        Domino.standing()
         .place("z-", scene.anchor(np.array([-1, 0.2, 0])))
     ))
     scene.add_child("start_2", (
-        Domino().standing()
+        Domino.standing()
         .place("z-", scene.anchor(np.array([-1, -0.2, 0])))
     ))
     scene.add_child("end", (
-        Domino().standing()
+        Domino.standing()
         .place("z-", scene.anchor(np.array([1, 0, 0])))
     ))
     scene.connect("start_1", "out", "gate", "in_1")
@@ -92,17 +92,17 @@ def scene_condition_gate_run() -> Component:
         ConditionGate()
     ))
     scene.add_child("start", (
-        Domino().standing()
+        Domino.standing()
         .place("z-", scene.anchor(np.array([-1, 0, 0])))
     ))
     scene.add_child("end", (
-        Domino().standing()
+        Domino.standing()
         .place("z-", scene.anchor(np.array([1, 0, 0])))
     ))
     scene.connect("start", "out", "gate", "in")
     scene.connect("gate", "out", "end", "in")
     scene.add_child("condition", (
-        Domino().standing(-np.pi / 2)
+        Domino.standing(-np.pi / 2)
         .place("z-", scene.anchor(np.array([0, 1, 0])))
     ))
     scene.connect("condition", "out", "gate", "condition")
@@ -121,15 +121,15 @@ def scene_negative_condition_gate_run() -> Component:
         NegativeConditionGate()
     ))
     scene.add_child("start", (
-        Domino().standing()
+        Domino.standing()
         .place("z-", scene.anchor(np.array([-1, 0, 0])))
     ))
     scene.add_child("end", (
-        Domino().standing()
+        Domino.standing()
         .place("z-", scene.anchor(np.array([1, 0, 0])))
     ))
     scene.add_child("condition", (
-        Domino().standing(-np.pi / 2)
+        Domino.standing(-np.pi / 2)
         .place("z-", scene.anchor(np.array([-0.05, 1, 0])))
     ))
     scene.connect("start", "out", "gate", "in")
@@ -137,11 +137,11 @@ def scene_negative_condition_gate_run() -> Component:
     scene.connect("condition", "out", "gate", "condition")
     return scene
 
-def scene_half_adder() -> Component:
+def scene_half_adder(trigger: bool = True) -> Component:
     scene = Component()
     scale = 0.5
     scene.add_child("A", (
-        Domino().standing()
+        Domino.standing()
         .place("z-", scene.anchor(np.array([-scale * 3, scale, 0])))
     ))
     scene.add_child("A_branch", (
@@ -151,7 +151,7 @@ def scene_half_adder() -> Component:
     ))
     scene.connect("A", "out", "A_branch", "in")
     scene.add_child("B", (
-        Domino().standing()
+        Domino.standing()
         .place("z-", scene.anchor(np.array([-scale * 3, -scale, 0])))
     ))
     scene.add_child("B_branch", (
@@ -234,18 +234,19 @@ def scene_half_adder() -> Component:
     scene.connect("uturn_branch", "out_2", "not", "in")
     scene.connect("and_branch", "out_2", "not", "condition")
     scene.add_child("S", (
-        Domino().standing()
+        Domino.standing()
         .place("z-", scene.anchor(np.array([scale * 3, scale, 0])))
     ))
     scene.add_child("C", (
-        Domino().standing()
+        Domino.standing()
         .place("z-", scene.anchor(np.array([scale * 3, -scale, 0])))
     ))
     
     scene.connect("not", "out", "S", "in")
     scene.connect("and_branch", "out_1", "C", "in")
 
-    scene.child("A").trigger()
-    scene.child("B").trigger()
+    if trigger:
+        scene.child("A").trigger()
+        scene.child("B").trigger()
 
     return scene
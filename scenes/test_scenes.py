@@ -5,22 +5,22 @@ from Domino.components import *
 def build_scene_2() -> Component:
     scene = Component()
     scene.add_child("support", (
-        Domino().lying(np.pi / 2)
+        Domino.lying(np.pi / 2)
         .place("x+", scene.anchor(""))
     ))
     scene.add_child("output", (
-        Domino().standing()
+        Domino.standing()
         .place("x+z-", scene.child("support").anchor("x-y-"))
         .move(np.array([0.005, 0, 0]))
     ))
     scene.add_child("shaft_slanted", (
-        Domino().lying()
+        Domino.lying()
         .place("x+z+", scene.child("output").anchor("x-z-"))
         # .move(np.array([0.0009, 0, 0]))
         .rotate_to_touch(np.array([0.0075, 0, 0.015]), np.array([0, -1, 0]), Ground())
     ))
     # scene.add_child("shaft_flat", (
-    #     Domino().lying()
+    #     Domino.lying()
     #     .place("x+", scene.anchor(np.array([-1, 0, 0])))
     #     .move_to_touch(np.array([1, 0, 0]), scene.child("shaft_slanted"))
     # ))
@@ -31,7 +31,7 @@ def build_scene_2() -> Component:
     #     .move(np.array([-0.01, 0, 0]))
     # ))
     # scene.add_child("trigger", (
-    #     Domino().standing()
+    #     Domino.standing()
     #     .place("x-z-", scene.child("support").anchor("x+y+"))
     #     .move(np.array([0.125, 0, 0]))
     #     .rotate("x+z-", np.array([0, 1, 0]), np.radians(-10))
@@ -66,15 +66,15 @@ def build_scene_4() -> Component:
     ))
     y = scene.child("gate").child("in").to_world().position[1]
     scene.add_child("start", (
-        Domino().standing()
+        Domino.standing()
         .place("z-", scene.anchor(np.array([-1, y, 0])))
     ))
     scene.add_child("end", (
-        Domino().standing()
+        Domino.standing()
         .place("z-", scene.anchor(np.array([1, y, 0])))
     ))
     scene.add_child("condition", (
-        Domino().standing(-np.pi / 2)
+        Domino.standing(-np.pi / 2)
         .place("z-", scene.anchor(np.array([0, 1, 0])))
     ))
     scene.connect("start", "out", "gate", "in")
@@ -104,15 +104,15 @@ def build_scene_6() -> Component:
         LeanAndGate()
     ))
     scene.add_child("start_1", (
-        Domino().standing()
+        Domino.standing()
         .place("z-", scene.anchor(np.array([-1, 0.1, 0])))
     ))
     scene.add_child("start_2", (
-        Domino().standing()
+        Domino.standing()
         .place("z-", scene.anchor(np.array([-1, -0.1, 0])))
     ))
     scene.add_child("end", (
-        Domino().standing()
+        Domino.standing()
         .place("z-", scene.anchor(np.array([1, 0, 0])))
     ))
     scene.connect("start_1", "out", "gate", "in_1")
@@ -139,11 +139,11 @@ def build_scene_7() -> Component:
 def build_scene_8() -> Component:
     scene = Component()
     scene.add_child("start", (
-        Domino().standing()
+        Domino.standing()
         .place("z-", scene.anchor(""))
     ))
     scene.add_child("end", (
-        Domino().standing()
+        Domino.standing()
         .place("z-", scene.anchor(np.array([2, 0.3, 0])))
         .rotate("", "z+", np.pi / 2)
     ))
@@ -181,15 +181,15 @@ def test_scene_side_branch() -> Component:
         SideBranch()
     ))
     scene.add_child("start", (
-        Domino().standing()
+        Domino.standing()
         .place("z-", scene.anchor(np.array([-1, 0, 0])))
     ))
     scene.add_child("end_1", (
-        Domino().standing()
+        Domino.standing()
         .place("z-", scene.anchor(np.array([1, 0, 0])))
     ))
     scene.add_child("end_2", (
-        Domino().standing(np.pi / 2)
+        Domino.standing(np.pi / 2)
         .place("z-", scene.anchor(np.array([0, 1, 0])))
     ))
     scene.connect("start", "out", "side_branch", "in")
@@ -200,7 +200,7 @@ def test_scene_side_branch() -> Component:
 def test_scene_impulse_trigger() -> Component:
     scene = Component()
     scene.add_child("shaft", (
-        Domino().lying()
+        Domino.lying()
         .place("x+", scene.anchor(""))
     ))
     scene.add_child("trigger_1", (
@@ -219,7 +219,7 @@ def test_scene_impulse_trigger() -> Component:
         LineDomino.from_socket(scene.child("trigger_2").socket("out"), 1)
     ))
     scene.add_child("perpendicular", (
-        Domino().standing(np.pi / 2)
+        Domino.standing(np.pi / 2)
         .place("z-", scene.child("shaft").anchor("x-"))
     ))
     scene.add_child("line_3", (
@@ -253,19 +253,19 @@ def test_scene_crossing() -> Component:
     ))
     span = 0.5
     scene.add_child("start_1", (
-        Domino().standing()
+        Domino.standing()
         .place("z-", scene.anchor(np.array([-span, 0, 0])))
     ))
     scene.add_child("end_1", (
-        Domino().standing()
+        Domino.standing()
         .place("z-", scene.anchor(np.array([span, 0, 0])))
     ))
     scene.add_child("start_2", (
-        Domino().standing(np.pi / 2)
+        Domino.standing(np.pi / 2)
         .place("z-", scene.anchor(np.array([0, -span, 0])))
     ))
     scene.add_child("end_2", (
-        Domino().standing(np.pi / 2)
+        Domino.standing(np.pi / 2)
         .place("z-", scene.anchor(np.array([0, span, 0])))
     ))
     scene.connect("start_1", "out", "crossing", "in_1")
@@ -280,11 +280,11 @@ def test_scene_u_turn() -> Component:
         UTurn()
     ))
     scene.add_child("start", (
-        Domino().standing()
+        Domino.standing()
         .place("z-", scene.anchor(np.array([-1, -0.2, 0])))
     ))
     scene.add_child("end", (
-        Domino().standing(np.pi)
+        Domino.standing(np.pi)
         .place("z-", scene.anchor(np.array([-1, 0.2, 0])))
     ))
     scene.connect("start", "out", "u_turn", "in_1")
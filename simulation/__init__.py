@@ -0,0 +1,23 @@
+from .robustness import Perturbation, RobustnessAnalysis, RobustnessCase
+from .rollout import Rollout, RolloutResult
+from .runner import HeadlessRunner, RunResult
+from .state_buffer import StateBuffer
+from .timeline import ToppleRecorder
+from .trajectory import TrajectoryReader, TrajectoryWriter
+from .truth_table import TruthTableHarness, TruthTableRow
+
+__all__ = [
+    "HeadlessRunner",
+    "Perturbation",
+    "RobustnessAnalysis",
+    "RobustnessCase",
+    "Rollout",
+    "RolloutResult",
+    "RunResult",
+    "StateBuffer",
+    "ToppleRecorder",
+    "TrajectoryReader",
+    "TrajectoryWriter",
+    "TruthTableHarness",
+    "TruthTableRow",
+]
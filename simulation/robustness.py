@@ -0,0 +1,136 @@
+import copy
+import time
+from dataclasses import dataclass
+
+import numpy as np
+import mujoco
+
+from Domino.simulation.rollout import Rollout
+from Domino.simulation.timeline import ToppleRecorder
+from Domino.simulation.truth_table import TruthTableHarness
+
+
+@dataclass(frozen=True)
+class Perturbation:
+    # Standard deviations of the noise added to every domino body before a rollout.
+    position: float = 0.5E-3
+    yaw: float = np.radians(0.5)
+    # Of the log of a factor on the sliding friction of every geom.
+    friction: float = 0.1
+
+
+@dataclass
+class RobustnessCase:
+    # Over R perturbed rollouts of one input combination: (R, O) outputs, and (R, P) first topple times of the
+    # outputs then the probes (NaN if nothing under the path toppled).
+    inputs: tuple[bool, ...]
+    expected: tuple[bool, ...]
+    outputs: np.ndarray
+    latencies: np.ndarray
+
+    @property
+    def success(self) -> np.ndarray:
+        # (R,) whether every output was as expected.
+        return np.all(self.outputs == np.array(self.expected, dtype=bool), axis=1)
+
+
+class RobustnessAnalysis:
+    """
+    Monte Carlo check of how much a layout relies on exact contacts. For every input combination of a
+    `TruthTableHarness`, runs `samples` rollouts in parallel, each with domino bodies shifted in the ground plane and
+    turned about z by Gaussian noise and with every geom's friction scaled, and reports the success probability (all
+    outputs as in the unperturbed run, or as expected) and the latency distribution of the outputs and of probe paths
+    such as the gates inside a scene.
+    """
+    SAMPLE_INTERVAL = 0.02
+
+    def __init__(self, harness: TruthTableHarness, perturbation: Perturbation = Perturbation(), samples: int = 32, probes: list[str] | None = None, seed: int | None = None, max_workers: int | None = None):
+        self.harness = harness
+        self.perturbation = perturbation
+        self.samples = samples
+        self.probes = probes if probes is not None else []
+        self.rng = np.random.default_rng(seed)
+        self.max_workers = max_workers
+        self.recorder = ToppleRecorder(harness.model, harness.compiled_scene)
+        self.qpos_addresses = harness.model.jnt_qposadr[harness.model.body_jntadr[self.recorder.bodies]]
+
+    def perturbed_qpos(self, qpos: np.ndarray) -> np.ndarray:
+        # (samples, nq) copies of qpos with every body moved in x, y and turned about the world z axis.
+        batch = np.tile(qpos, (self.samples, 1))
+        shape = (self.samples, len(self.qpos_addresses))
+        positions = self.qpos_addresses[:, np.newaxis] + np.arange(2)
+        batch[:, positions] += self.rng.normal(0, self.perturbation.position, (*shape, 2))
+        quaternions = batch[:, self.qpos_addresses[:, np.newaxis] + np.arange(3, 7)]
+        half_yaws = self.rng.normal(0, self.perturbation.yaw, shape) / 2
+        c, s = np.cos(half_yaws), np.sin(half_yaws)
+        w, x, y, z = np.moveaxis(quaternions, -1, 0)
+        # Product (c, 0, 0, s) * (w, x, y, z), the rotation about the world z axis applied after the body rotation.
+        turned = np.stack([c * w - s * z, c * x - s * y, c * y + s * x, c * z + s * w], axis=-1)
+        batch[:, self.qpos_addresses[:, np.newaxis] + np.arange(3, 7)] = turned
+        return batch
+
+    def perturbed_models(self) -> list[mujoco.MjModel]:
+        models = []
+        for _ in range(self.samples):
+            model = copy.copy(self.harness.model)
+            model.geom_friction[:, 0] *= np.exp(self.rng.normal(0, self.perturbation.friction, model.ngeom))
+            models.append(model)
+        return models
+
+    def run_case(self, inputs: tuple[bool, ...], expected: tuple[bool, ...]) -> RobustnessCase:
+        rollout = Rollout(self.perturbed_models(), ("xpos", "xquat"), RobustnessAnalysis.SAMPLE_INTERVAL, self.max_workers)
+        result = rollout.run(self.perturbed_qpos(self.harness.case_qpos(inputs)), duration=self.harness.max_time)
+        topple_times = self.recorder.batch_topple_times(result)
+        paths = [*self.harness.outputs, *self.probes]
+        # NOTE fmin ignores NaN without the all-NaN warning of nanmin.
+        latencies = np.column_stack([np.fmin.reduce(topple_times[:, self.recorder.bodies_under(path)], axis=1) for path in paths])
+        return RobustnessCase(
+            inputs=inputs,
+            expected=expected,
+            outputs=~np.isnan(latencies[:, :len(self.harness.outputs)]),
+            latencies=latencies,
+        )
+
+    def run(self, expected: dict[tuple[bool, ...], tuple[bool, ...]] | None = None) -> list[RobustnessCase]:
+        # Without expected outputs, the unperturbed truth table is taken as the expected one.
+        if expected is None:
+            expected = {row.inputs: row.outputs for row in self.harness.run(self.max_workers)}
+        return [self.run_case(inputs, expected[inputs]) for inputs in self.harness.cases()]
+
+    def format(self, cases: list[RobustnessCase]) -> str:
+        paths = [*self.harness.outputs, *self.probes]
+        lines = []
+        for case in cases:
+            inputs = " ".join(f"{name}={int(value)}" for name, value in zip(self.harness.inputs, case.inputs))
+            lines.append(f"{inputs}: success {np.mean(case.success):.0%} of {len(case.success)}")
+            for path, latencies in zip(paths, case.latencies.T):
+                toppled = latencies[~np.isnan(latencies)]
+                if len(toppled) == 0:
+                    lines.append(f"  {path}: never toppled")
+                    continue
+                low, median, high = np.percentile(toppled, [10, 50, 90])
+                lines.append(f"  {path}: toppled {len(toppled) / len(latencies):.0%}, latency p10 {low:.3f} p50 {median:.3f} p90 {high:.3f}")
+        return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    import sys
+    from Domino.components import ConditionGate, Crossing, LeanAndGate, NegativeConditionGate, OrGate
+    # Usage: python -m Domino.simulation.robustness [gate_name] [samples]
+    gates = {
+        "or": (OrGate, ["in_1", "in_2"], ["out"]),
+        "lean_and": (LeanAndGate, ["in_1", "in_2"], ["out"]),
+        "condition": (ConditionGate, ["in", "condition"], ["out"]),
+        "negative_condition": (NegativeConditionGate, ["in", "condition"], ["out"]),
+        "crossing": (Crossing, ["in_1", "in_2"], ["out_1", "out_2"]),
+    }
+    gate_class, inputs, outputs = gates[sys.argv[1] if len(sys.argv) > 1 else "lean_and"]
+    start_time = time.perf_counter()
+    analysis = RobustnessAnalysis(
+        TruthTableHarness.for_gate(gate_class(), inputs, outputs, max_time=4.0),
+        samples=int(sys.argv[2]) if len(sys.argv) > 2 else 16,
+        probes=["gate"],
+        seed=0,
+    )
+    print(analysis.format(analysis.run()))
+    print(f"done in {time.perf_counter() - start_time:.1f} s")
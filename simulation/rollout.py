@@ -0,0 +1,79 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+import mujoco
+
+
+@dataclass
+class RolloutResult:
+    # (T,) sample times, and for each recorded MjData field a (B, T, ...) array of its samples.
+    times: np.ndarray
+    quantities: dict[str, np.ndarray]
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.quantities[name]
+
+
+class Rollout:
+    """
+    Steps a batch of initial states of one scene across a thread pool, relying on mj_step releasing the GIL. Each
+    worker thread keeps its own `MjData`, reset for every batch element. The given `MjData` fields (e.g. "qpos", "xpos",
+    "xquat") are sampled every sample_interval seconds of simulated time into preallocated (B, T, ...) arrays, body
+    fields after mj_kinematics so that they match qpos. Pass a list of models, one per batch element, to vary model
+    parameters such as friction. They must have the same sizes, as made by copying one model.
+    """
+    def __init__(self, model: mujoco.MjModel | list[mujoco.MjModel], quantities: tuple[str, ...] = ("qpos",), sample_interval: float = 0.05, max_workers: int | None = None):
+        self.models = model if isinstance(model, list) else [model]
+        for other in self.models[1:]:
+            if (other.nq, other.nv, other.nbody) != (self.models[0].nq, self.models[0].nv, self.models[0].nbody):
+                raise ValueError("rollout models must have the same sizes")
+        self.quantities = quantities
+        self.steps_per_sample = max(1, int(round(sample_interval / self.models[0].opt.timestep)))
+        self.max_workers = max_workers
+        self._local = threading.local()
+
+    def _data(self) -> mujoco.MjData:
+        # NOTE One MjData per worker thread, reused across batch elements.
+        if not hasattr(self._local, "data"):
+            self._local.data = mujoco.MjData(self.models[0])
+        return self._local.data
+
+    def _run_one(self, index: int, qpos: np.ndarray, qvel: np.ndarray | None, result: RolloutResult) -> None:
+        model = self.models[index] if len(self.models) > 1 else self.models[0]
+        data = self._data()
+        mujoco.mj_resetData(model, data)
+        data.qpos[:] = qpos
+        if qvel is not None:
+            data.qvel[:] = qvel
+        for sample in range(len(result.times)):
+            if sample > 0:
+                mujoco.mj_step(model, data, nstep=self.steps_per_sample)
+            mujoco.mj_kinematics(model, data)
+            for name, samples in result.quantities.items():
+                samples[index, sample] = getattr(data, name)
+
+    def run(self, qpos: np.ndarray, qvel: np.ndarray | None = None, duration: float = 10.0) -> RolloutResult:
+        # (B, nq) initial positions and optional (B, nv) velocities, e.g. from HeadlessRunner or perturbed qpos0.
+        qpos = np.atleast_2d(qpos)
+        batch_size = len(qpos)
+        if len(self.models) > 1 and len(self.models) != batch_size:
+            raise ValueError(f"got {len(self.models)} models for a batch of {batch_size}")
+        if qvel is not None:
+            qvel = np.broadcast_to(qvel, (batch_size, self.models[0].nv))
+        timestep = self.models[0].opt.timestep
+        sample_count = int(round(duration / timestep)) // self.steps_per_sample + 1
+        data = self._data()
+        result = RolloutResult(
+            times=np.arange(sample_count) * self.steps_per_sample * timestep,
+            quantities={name: np.empty((batch_size, sample_count, *np.shape(getattr(data, name)))) for name in self.quantities},
+        )
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [
+                executor.submit(self._run_one, index, qpos[index], qvel[index] if qvel is not None else None, result)
+                for index in range(batch_size)
+            ]
+            for future in futures:
+                future.result()
+        return result
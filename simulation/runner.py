@@ -0,0 +1,90 @@
+import time
+from dataclasses import dataclass
+
+import numpy as np
+import mujoco
+
+
+@dataclass
+class RunResult:
+    # Simulated time and steps, wall clock seconds, and whether the run stopped because the scene came to rest.
+    sim_time: float
+    steps: int
+    wall_time: float
+    quiescent: bool
+
+
+class HeadlessRunner:
+    """
+    Steps a model without a viewer, as fast as possible. The run stops at max_time, or once every free body has moved
+    slower than SPEED_THRESHOLD and spun slower than SPIN_THRESHOLD for quiescence_window seconds. Velocities are
+    checked every check_interval seconds of simulated time, in between the steps are taken in one mj_step call.
+    Recorders, e.g. a `ToppleRecorder`, get record(data) called at the start and at every check.
+    """
+    SPEED_THRESHOLD = 1.0E-2
+    SPIN_THRESHOLD = 1.0E-1
+
+    def __init__(self, model: mujoco.MjModel, data: mujoco.MjData | None = None, max_time: float = 10.0, quiescence_window: float = 0.5, check_interval: float = 0.05, recorders: list | None = None):
+        self.model = model
+        self.data = data if data is not None else mujoco.MjData(model)
+        self.max_time = max_time
+        self.quiescence_window = quiescence_window
+        self.steps_per_check = max(1, int(round(check_interval / model.opt.timestep)))
+        self.recorders = recorders if recorders is not None else []
+        # qvel of a free joint is the linear then the angular velocity, 3 dofs each.
+        free_joints = np.flatnonzero(model.jnt_type == mujoco.mjtJoint.mjJNT_FREE)
+        dof_addresses = model.jnt_dofadr[free_joints]
+        self.linear_dofs = dof_addresses[:, np.newaxis] + np.arange(3)
+        self.angular_dofs = dof_addresses[:, np.newaxis] + np.arange(3, 6)
+
+    def is_moving(self, data: mujoco.MjData | None = None) -> bool:
+        data = data if data is not None else self.data
+        qvel = data.qvel
+        speeds_squared = np.sum(qvel[self.linear_dofs] ** 2, axis=1)
+        spins_squared = np.sum(qvel[self.angular_dofs] ** 2, axis=1)
+        return bool(np.any(speeds_squared > HeadlessRunner.SPEED_THRESHOLD ** 2) or np.any(spins_squared > HeadlessRunner.SPIN_THRESHOLD ** 2))
+
+    def run(self) -> RunResult:
+        model, data = self.model, self.data
+        wall_start_time = time.perf_counter()
+        # NOTE Steps are counted rather than compared by data.time, which drifts from step * timestep.
+        start_step = step = int(round(data.time / model.opt.timestep))
+        end_step = int(round(self.max_time / model.opt.timestep))
+        rest_start_time = data.time
+        quiescent = False
+        for recorder in self.recorders:
+            recorder.record(data)
+        while step < end_step:
+            step_count = min(self.steps_per_check, end_step - step)
+            mujoco.mj_step(model, data, nstep=step_count)
+            step += step_count
+            for recorder in self.recorders:
+                recorder.record(data)
+            if self.is_moving():
+                rest_start_time = data.time
+            elif data.time - rest_start_time >= self.quiescence_window:
+                quiescent = True
+                break
+        return RunResult(
+            sim_time=data.time,
+            steps=step - start_step,
+            wall_time=time.perf_counter() - wall_start_time,
+            quiescent=quiescent,
+        )
+
+
+if __name__ == "__main__":
+    import sys
+    from Domino.compiler import CompiledScene, build_model
+    from Domino.scenes import demo_scenes, test_scenes
+    from Domino.simulation.timeline import ToppleRecorder
+    # Usage: python -m Domino.simulation.runner scene_name [max_time]
+    scene_name = sys.argv[1] if len(sys.argv) > 1 else "scene_half_adder"
+    scene_function = getattr(demo_scenes, scene_name, None) or getattr(test_scenes, scene_name)
+    compiled_scene = CompiledScene.from_component(scene_function())
+    model = build_model(compiled_scene)
+    recorder = ToppleRecorder(model, compiled_scene)
+    result = HeadlessRunner(model, max_time=float(sys.argv[2]) if len(sys.argv) > 2 else 10.0, recorders=[recorder]).run()
+    print(f"{scene_name}: {result}")
+    for topple_time, path in recorder.timeline():
+        print(f"{topple_time:8.3f}  {path}")
@@ -0,0 +1,69 @@
+import numpy as np
+import mujoco
+
+
+class StateBuffer:
+    """
+    Ring buffer of physics states, preallocated as a (capacity, nstate) array and filled through mj_getState. Sample k
+    is the state at the first record() call at or after time k * sample_interval, kept with the time it was taken at,
+    and lives in row k % capacity, so looking up a time only checks a row or two. Once full, the oldest samples are
+    overwritten. restore(data, t) sets the latest state at or before t through mj_setState, for rewinding the viewer
+    or branching an experiment without simulating again from t = 0.
+    """
+    STATE_SPEC = mujoco.mjtState.mjSTATE_INTEGRATION
+
+    def __init__(self, model: mujoco.MjModel, capacity: int = 1000, sample_interval: float = 0.05):
+        self.model = model
+        self.sample_interval = sample_interval
+        self.states = np.empty((capacity, mujoco.mj_stateSize(model, StateBuffer.STATE_SPEC)))
+        # Per row, the sample number it holds, -1 if none, and the time the state was taken at.
+        self.sample_numbers = np.full(capacity, -1)
+        self.sample_times = np.full(capacity, np.nan)
+        self.newest = -1
+
+    def __len__(self) -> int:
+        return np.count_nonzero(self.sample_numbers >= 0)
+
+    @property
+    def capacity(self) -> int:
+        return len(self.states)
+
+    def sample_number(self, time: float) -> int:
+        # NOTE The tolerance keeps times that drifted just below a sample time on that sample.
+        return int(np.floor(time / self.sample_interval + 1.0E-6))
+
+    def record(self, data: mujoco.MjData) -> None:
+        # Keeps the state if data.time reached a sample time not recorded yet, e.g. as a HeadlessRunner recorder.
+        sample = self.sample_number(data.time)
+        if sample <= self.newest:
+            return
+        row = sample % self.capacity
+        mujoco.mj_getState(self.model, data, self.states[row], StateBuffer.STATE_SPEC)
+        self.sample_numbers[row] = sample
+        self.sample_times[row] = data.time
+        self.newest = sample
+
+    def state_at(self, time: float) -> np.ndarray | None:
+        # The state of the latest sample taken at or before time, None if it was not recorded or was overwritten.
+        # NOTE A sample is taken at or after its nominal time, so the one for time may be later than time, and samples
+        # are skipped when record() is called less often than sample_interval. Earlier rows are checked then.
+        tolerance = 1.0E-6 * self.sample_interval
+        for sample in range(min(self.sample_number(time), self.newest), max(self.newest - self.capacity, -1), -1):
+            row = sample % self.capacity
+            if self.sample_numbers[row] == sample and self.sample_times[row] <= time + tolerance:
+                return self.states[row]
+        return None
+
+    def restore(self, data: mujoco.MjData, time: float) -> float:
+        # Sets data to the state at or before time and returns its time. Samples after it are dropped, since the
+        # simulation continues from there on another branch.
+        state = self.state_at(time)
+        if state is None:
+            raise ValueError(f"no state recorded at time {time}")
+        mujoco.mj_setState(self.model, data, state, StateBuffer.STATE_SPEC)
+        mujoco.mj_forward(self.model, data)
+        self.newest = self.sample_number(data.time)
+        dropped = self.sample_numbers > self.newest
+        self.sample_numbers[dropped] = -1
+        self.sample_times[dropped] = np.nan
+        return data.time
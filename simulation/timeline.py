@@ -0,0 +1,81 @@
+import numpy as np
+import mujoco
+
+from Domino.components.domino import Domino
+from Domino.compiler.compiled_scene import CompiledScene
+from Domino.compiler.model_builder import domino_body_ids
+from Domino.simulation.rollout import RolloutResult
+
+
+class ToppleRecorder:
+    """
+    Records the first moment each domino body left its initial pose, by more than DISTANCE_THRESHOLD in position or
+    ANGLE_THRESHOLD in rotation, like the old ComponentTestPlugin. All bodies are compared in one vectorized pass over
+    data.xpos and data.xquat per record() call, and times map back to component paths through the compiled scene, so
+    that gate latency is the difference of first_topple_time() of two paths.
+    """
+    DISTANCE_THRESHOLD = 1.0E-2
+    ANGLE_THRESHOLD = 1.0E-1
+
+    def __init__(self, model: mujoco.MjModel, compiled_scene: CompiledScene):
+        leaves = np.flatnonzero(compiled_scene.leaves_of_kind(Domino))
+        self.bodies = domino_body_ids(model, compiled_scene)
+        self.model = model
+        self.compiled_scene = compiled_scene
+        self.leaves = leaves
+        leaf_paths = compiled_scene.leaf_paths
+        self.paths = [leaf_paths[leaf] for leaf in leaves]
+        self.initial_positions = None
+        self.initial_quaternions = None
+        # Per body, NaN until it topples.
+        self.topple_times = np.full(len(leaves), np.nan)
+
+    def reset(self, data: mujoco.MjData) -> None:
+        # Takes the current pose of every body as the initial one.
+        mujoco.mj_kinematics(self.model, data)
+        self.initial_positions = data.xpos[self.bodies].copy()
+        self.initial_quaternions = data.xquat[self.bodies].copy()
+        self.topple_times[:] = np.nan
+
+    @staticmethod
+    def moved(positions: np.ndarray, quaternions: np.ndarray, initial_positions: np.ndarray, initial_quaternions: np.ndarray) -> np.ndarray:
+        # (..., B) whether each body left its initial pose, for (..., B, 3) positions and (..., B, 4) quaternions.
+        distances = np.linalg.norm(positions - initial_positions, axis=-1)
+        cosines = np.abs(np.sum(quaternions * initial_quaternions, axis=-1))
+        angles = 2 * np.arccos(np.minimum(cosines, 1.0))
+        return (distances > ToppleRecorder.DISTANCE_THRESHOLD) | (angles > ToppleRecorder.ANGLE_THRESHOLD)
+
+    def record(self, data: mujoco.MjData) -> None:
+        if self.initial_positions is None:
+            self.reset(data)
+            return
+        moved = ToppleRecorder.moved(data.xpos[self.bodies], data.xquat[self.bodies], self.initial_positions, self.initial_quaternions)
+        self.topple_times[moved & np.isnan(self.topple_times)] = data.time
+
+    def batch_topple_times(self, result: RolloutResult) -> np.ndarray:
+        # (R, B) first topple times of a `Rollout` sampling "xpos" and "xquat", from each rollout's first sample.
+        positions = result["xpos"][:, :, self.bodies]
+        quaternions = result["xquat"][:, :, self.bodies]
+        moved = ToppleRecorder.moved(positions, quaternions, positions[:, :1], quaternions[:, :1])
+        first_samples = np.argmax(moved, axis=1)
+        return np.where(np.any(moved, axis=1), result.times[first_samples], np.nan)
+
+    def bodies_under(self, path: str) -> np.ndarray:
+        # (B,) mask of the bodies under path.
+        under = self.compiled_scene.leaves_under(path)[self.leaves]
+        if not np.any(under):
+            raise ValueError(f"no domino bodies under {path!r}")
+        return under
+
+    def timeline(self) -> list[tuple[float, str]]:
+        # (time, path) of every toppled body, in topple order.
+        toppled = np.flatnonzero(~np.isnan(self.topple_times))
+        order = toppled[np.argsort(self.topple_times[toppled], kind="stable")]
+        return [(float(self.topple_times[body]), self.paths[body]) for body in order]
+
+    def first_topple_time(self, path: str) -> float | None:
+        # Earliest topple time of the bodies under path, e.g. "and/blocker_1" or a whole gate. None if none toppled.
+        times = self.topple_times[self.bodies_under(path)]
+        if np.all(np.isnan(times)):
+            return None
+        return float(np.nanmin(times))
@@ -0,0 +1,189 @@
+import os
+import json
+from pathlib import Path
+
+import numpy as np
+import mujoco
+
+from Domino.components.domino import Domino
+from Domino.compiler.compiled_scene import CompiledScene
+from Domino.compiler.model_builder import domino_body_ids
+
+
+class TrajectoryWriter:
+    """
+    Streams qpos frames to a directory of fixed-size .npy chunks, each written through a memory map so that a long run
+    never holds more than one chunk in RAM. A frame is taken at the first record() call at or after each multiple of
+    sample_interval from start_time, and the time it was taken at is kept in a float64 chunk next to it, so calls
+    further apart than sample_interval give fewer frames rather than misplaced ones. Frames may be stored as float32
+    or float16 to halve or quarter the size, at the cost of precision (float16 positions are only good to millimeters
+    near the origin). header.json holds the layout, and the component path and qpos address of every free body when a
+    compiled scene is given. model.mjb is the model, so that a replay needs nothing else.
+    """
+    HEADER_FILE = "header.json"
+    MODEL_FILE = "model.mjb"
+    VERSION = 1
+
+    def __init__(self, path: str | Path, model: mujoco.MjModel, compiled_scene: CompiledScene | None = None, sample_interval: float = 0.02, dtype: str = "float32", chunk_frames: int = 256):
+        if dtype not in ("float64", "float32", "float16"):
+            raise ValueError(f"unsupported trajectory dtype: {dtype}")
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.model = model
+        mujoco.mj_saveModel(model, str(self.path / TrajectoryWriter.MODEL_FILE))
+        self.sample_interval = sample_interval
+        self.dtype = dtype
+        self.chunk_frames = chunk_frames
+        self.frame_count = 0
+        self.start_time = None
+        # Number of the first sample time not recorded yet, counted in sample_interval from start_time.
+        self.next_sample = 0
+        self._chunk = None
+        self._times = None
+        self.bodies = []
+        if compiled_scene is not None:
+            leaves = np.flatnonzero(compiled_scene.leaves_of_kind(Domino))
+            leaf_paths = compiled_scene.leaf_paths
+            for leaf, body in zip(leaves, domino_body_ids(model, compiled_scene)):
+                self.bodies.append({
+                    "path": leaf_paths[leaf],
+                    "qpos_address": int(model.jnt_qposadr[model.body_jntadr[body]]),
+                })
+
+    @staticmethod
+    def chunk_file(index: int) -> str:
+        return f"chunk_{index:05d}.npy"
+
+    @staticmethod
+    def times_file(index: int) -> str:
+        return f"times_{index:05d}.npy"
+
+    def write_header(self) -> None:
+        header = {
+            "version": TrajectoryWriter.VERSION,
+            "nq": self.model.nq,
+            "dtype": self.dtype,
+            "sample_interval": self.sample_interval,
+            "start_time": self.start_time if self.start_time is not None else 0.0,
+            "chunk_frames": self.chunk_frames,
+            "frame_count": self.frame_count,
+            "bodies": self.bodies,
+        }
+        # NOTE Write then rename, so that a reader never sees a partial header.
+        temp_path = self.path / f"{TrajectoryWriter.HEADER_FILE}.{os.getpid()}.tmp"
+        with open(temp_path, "w") as file:
+            json.dump(header, file)
+        os.replace(temp_path, self.path / TrajectoryWriter.HEADER_FILE)
+
+    def append(self, qpos: np.ndarray, time: float) -> None:
+        row = self.frame_count % self.chunk_frames
+        if row == 0:
+            if self._chunk is not None:
+                self.flush()
+                self.write_header()
+            chunk_index = self.frame_count // self.chunk_frames
+            self._chunk = np.lib.format.open_memmap(
+                self.path / TrajectoryWriter.chunk_file(chunk_index),
+                mode="w+", dtype=self.dtype, shape=(self.chunk_frames, self.model.nq)
+            )
+            self._times = np.lib.format.open_memmap(
+                self.path / TrajectoryWriter.times_file(chunk_index), mode="w+", dtype=float, shape=(self.chunk_frames,)
+            )
+        self._chunk[row] = qpos
+        self._times[row] = time
+        self.frame_count += 1
+
+    def record(self, data: mujoco.MjData) -> None:
+        # Appends a frame if data.time reached a sample time not recorded yet, e.g. as a HeadlessRunner recorder.
+        if self.start_time is None:
+            self.start_time = data.time
+        # NOTE The tolerance keeps times that drifted just below a sample time on that sample.
+        sample = int(np.floor((data.time - self.start_time) / self.sample_interval + 1.0E-6))
+        if sample < self.next_sample:
+            return
+        self.append(data.qpos, data.time)
+        self.next_sample = sample + 1
+
+    def flush(self) -> None:
+        self._chunk.flush()
+        self._times.flush()
+
+    def close(self) -> None:
+        if self._chunk is not None:
+            self.flush()
+            self._chunk = None
+            self._times = None
+        self.write_header()
+
+    def __enter__(self) -> "TrajectoryWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class TrajectoryReader:
+    """
+    Reads a trajectory written by `TrajectoryWriter`. Chunks are memory-mapped on first use, so slicing a time range or
+    a subset of bodies only touches the chunks and pages it needs. Frames are returned as float64, and times holds
+    the time each one was taken at.
+    """
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        with open(self.path / TrajectoryWriter.HEADER_FILE) as file:
+            self.header = json.load(file)
+        if self.header["version"] != TrajectoryWriter.VERSION:
+            raise ValueError(f"unsupported trajectory version {self.header['version']} in {self.path}")
+        self.sample_interval = self.header["sample_interval"]
+        self.start_time = self.header["start_time"]
+        self.chunk_frames = self.header["chunk_frames"]
+        self.paths = [body["path"] for body in self.header["bodies"]]
+        self.qpos_addresses = np.array([body["qpos_address"] for body in self.header["bodies"]], dtype=int)
+        self._chunks = {}
+        chunk_count = -(-len(self) // self.chunk_frames)
+        times = [np.load(self.path / TrajectoryWriter.times_file(index)) for index in range(chunk_count)]
+        self.times = np.concatenate([np.empty(0), *times])[:len(self)]
+
+    def __len__(self) -> int:
+        return self.header["frame_count"]
+
+    def frame_range(self, start_time: float | None = None, end_time: float | None = None) -> range:
+        # Frames with start_time <= time < end_time.
+        tolerance = 1.0E-6 * self.sample_interval
+        start = 0 if start_time is None else int(np.searchsorted(self.times, start_time - tolerance))
+        end = len(self) if end_time is None else int(np.searchsorted(self.times, end_time - tolerance))
+        return range(start, max(start, end))
+
+    def load_model(self) -> mujoco.MjModel:
+        return mujoco.MjModel.from_binary_path(str(self.path / TrajectoryWriter.MODEL_FILE))
+
+    def frame(self, index: int) -> np.ndarray:
+        # (nq,) qpos of one frame.
+        chunk_index, row = divmod(index, self.chunk_frames)
+        return self.chunk(chunk_index)[row].astype(float)
+
+    def chunk(self, index: int) -> np.ndarray:
+        if index not in self._chunks:
+            self._chunks[index] = np.load(self.path / TrajectoryWriter.chunk_file(index), mmap_mode="r")
+        return self._chunks[index]
+
+    def bodies_under(self, path: str) -> np.ndarray:
+        # Indices of the bodies whose component path is path or below it.
+        if path == "":
+            return np.arange(len(self.paths))
+        prefix = f"{path}/"
+        return np.array([index for index, body_path in enumerate(self.paths) if body_path == path or body_path.startswith(prefix)], dtype=int)
+
+    def qpos(self, start_time: float | None = None, end_time: float | None = None, bodies: np.ndarray | None = None) -> np.ndarray:
+        # (F, nq) frames in the time range, or (F, K, 7) free joint qpos of the given body indices.
+        frames = self.frame_range(start_time, end_time)
+        columns = slice(None) if bodies is None else (self.qpos_addresses[bodies][:, np.newaxis] + np.arange(7))
+        shape = (len(frames), self.header["nq"]) if bodies is None else (len(frames), len(bodies), 7)
+        result = np.empty(shape)
+        frame = frames.start
+        while frame < frames.stop:
+            chunk_index, row = divmod(frame, self.chunk_frames)
+            count = min(self.chunk_frames - row, frames.stop - frame)
+            result[frame - frames.start:frame - frames.start + count] = self.chunk(chunk_index)[row:row + count][:, columns]
+            frame += count
+        return result
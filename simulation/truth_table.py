@@ -0,0 +1,121 @@
+import itertools
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+import mujoco
+
+from Domino.components.component import Component
+from Domino.components.domino import Domino
+from Domino.components.line_domino import LineDomino
+from Domino.compiler.compiled_scene import CompiledScene
+from Domino.compiler.model_builder import PhysicsOptions, build_model, quaternions_from_rotations
+from Domino.simulation.runner import HeadlessRunner, RunResult
+from Domino.simulation.timeline import ToppleRecorder
+
+
+@dataclass
+class TruthTableRow:
+    # Output i is True if a body under outputs[i] toppled, latencies[i] is when it first did (None if it never did).
+    inputs: tuple[bool, ...]
+    outputs: tuple[bool, ...]
+    latencies: tuple[float | None, ...]
+    result: RunResult
+
+
+class TruthTableHarness:
+    """
+    Runs every combination of inputs of a scene and reports which outputs fell and when. Inputs are paths of
+    components with a trigger() method (`Domino`, `LineDomino`), left standing in the scene; outputs are paths whose
+    first toppled body marks a True output. The model is compiled once, each case is a separate `MjData` whose
+    triggered inputs start from their leaning pose, and the cases run concurrently in a thread pool (mj_step releases
+    the GIL).
+    """
+    LEAD_LENGTH = 0.3
+
+    def __init__(self, scene: Component, inputs: list[str], outputs: list[str], max_time: float = 10.0, options: PhysicsOptions = PhysicsOptions()):
+        self.inputs = inputs
+        self.outputs = outputs
+        self.max_time = max_time
+        self.compiled_scene = CompiledScene.from_component(scene)
+        self.model = build_model(self.compiled_scene, options=options)
+        # qpos addresses of the body of each domino leaf, -1 for other leaves.
+        recorder = ToppleRecorder(self.model, self.compiled_scene)
+        self.leaf_qpos_addresses = np.full(len(self.compiled_scene), -1)
+        self.leaf_qpos_addresses[recorder.leaves] = self.model.jnt_qposadr[self.model.body_jntadr[recorder.bodies]]
+        self.triggered_qpos = [self.triggered_qpos_of(scene, path) for path in inputs]
+
+    @staticmethod
+    def for_gate(gate: Component, inputs: list[str], outputs: list[str], lead_length: float = LEAD_LENGTH, **kwargs) -> "TruthTableHarness":
+        # Wires a line into each input socket and out of each output socket, named after the socket.
+        scene = Component()
+        scene.add_child("gate", gate)
+        for socket in inputs:
+            scene.add_child(socket, LineDomino.to_socket(gate.socket(socket), lead_length))
+        for socket in outputs:
+            scene.add_child(socket, LineDomino.from_socket(gate.socket(socket), lead_length))
+        return TruthTableHarness(scene, inputs, outputs, **kwargs)
+
+    def triggered_qpos_of(self, scene: Component, path: str) -> tuple[np.ndarray, np.ndarray]:
+        # (K,) qpos addresses and (K, 7) free joint qpos of the domino bodies under path once it is triggered.
+        component = scene
+        for name in path.split("/"):
+            component = component.child(name)
+        triggered = component.copy().trigger()
+        triggered_scene = CompiledScene.from_component(triggered)
+        parent_to_world = component.parent.to_world() if component.parent is not None else None
+        leaf_to_world = triggered_scene.leaf_to_world[triggered_scene.leaves_of_kind(Domino)]
+        if parent_to_world is not None:
+            leaf_to_world = parent_to_world * leaf_to_world
+        leaves = self.compiled_scene.leaves_under(path) & self.compiled_scene.leaves_of_kind(Domino)
+        if np.count_nonzero(leaves) != len(leaf_to_world):
+            raise ValueError(f"triggering {path!r} changed its number of dominoes")
+        qpos = np.column_stack([leaf_to_world.positions, quaternions_from_rotations(leaf_to_world.rotations)])
+        return self.leaf_qpos_addresses[leaves], qpos
+
+    def case_qpos(self, inputs: tuple[bool, ...]) -> np.ndarray:
+        # (nq,) initial qpos with the given inputs triggered.
+        case_qpos = self.model.qpos0.copy()
+        for triggered, (addresses, qpos) in zip(inputs, self.triggered_qpos):
+            if triggered:
+                case_qpos[addresses[:, np.newaxis] + np.arange(7)] = qpos
+        return case_qpos
+
+    def cases(self) -> list[tuple[bool, ...]]:
+        return list(itertools.product([False, True], repeat=len(self.inputs)))
+
+    def run_case(self, inputs: tuple[bool, ...]) -> TruthTableRow:
+        data = mujoco.MjData(self.model)
+        data.qpos[:] = self.case_qpos(inputs)
+        recorder = ToppleRecorder(self.model, self.compiled_scene)
+        result = HeadlessRunner(self.model, data, max_time=self.max_time, recorders=[recorder]).run()
+        latencies = tuple(recorder.first_topple_time(path) for path in self.outputs)
+        return TruthTableRow(
+            inputs=inputs,
+            outputs=tuple(latency is not None for latency in latencies),
+            latencies=latencies,
+            result=result,
+        )
+
+    def run(self, max_workers: int | None = None) -> list[TruthTableRow]:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(self.run_case, self.cases()))
+
+    def format(self, rows: list[TruthTableRow]) -> str:
+        lines = [" ".join([*self.inputs, "|", *self.outputs, "|", *(f"t({output})" for output in self.outputs)])]
+        for row in rows:
+            cells = [f"{int(value):>{len(name)}}" for name, value in zip([*self.inputs, *self.outputs], [*row.inputs, *row.outputs])]
+            latencies = [f"{'-' if latency is None else f'{latency:.3f}':>{len(output) + 3}}" for output, latency in zip(self.outputs, row.latencies)]
+            lines.append(" ".join([*cells[:len(self.inputs)], "|", *cells[len(self.inputs):], "|", *latencies]))
+        return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    from Domino.scenes.demo_scenes import scene_half_adder
+    # Usage: python -m Domino.simulation.truth_table
+    start_time = time.perf_counter()
+    harness = TruthTableHarness(scene_half_adder(trigger=False), ["A", "B"], ["S", "C"], max_time=10.0)
+    rows = harness.run()
+    print(harness.format(rows))
+    print(f"{len(rows)} cases in {time.perf_counter() - start_time:.1f} s")